@@ -0,0 +1,68 @@
+# benchmarks/test_bench_metrics.py
+#
+# Wall time and peak memory of the four indicators from 1e3 to 1e7 rows.
+#
+#   pip install pytest-benchmark
+#   python -m pytest benchmarks --benchmark-only
+#   MCM_BENCH_MAX_ROWS=10000000 python -m pytest benchmarks --benchmark-only
+#   python -m pytest benchmarks --benchmark-only --benchmark-save=baseline
+#   python -m pytest benchmarks --benchmark-only --benchmark-compare
+#
+# Peak memory (tracemalloc, measured in a separate untimed run) is stored in
+# each benchmark's extra_info["peak_mib"].
+import functools
+import os
+import tracemalloc
+
+import pytest
+
+from market_competition_metrics import MarketCompetitionMetrics
+from market_competition_metrics.synthetic import generate_market_data
+
+pytest.importorskip("pytest_benchmark")
+
+N_FIRMS = 50
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+MAX_ROWS = int(float(os.environ.get("MCM_BENCH_MAX_ROWS", 10**6)))
+
+CALLS = {
+    "hhi": lambda df: MarketCompetitionMetrics.hhi(df, share_col="Market_share", period_col="Period"),
+    "lerner": lambda df: MarketCompetitionMetrics.lerner(
+        df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost",
+        share_col="Market_share", period_col="Period"
+    ),
+    "panzar_rosse": lambda df: MarketCompetitionMetrics.panzar_rosse(
+        df, revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period"
+    ),
+    "boone": lambda df: MarketCompetitionMetrics.boone(
+        df, cost_cols=["Labor_cost", "Capital_cost", "Wage_cost"], profit_col="Profit", period_col="Period"
+    ),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _data(n_rows):
+    return generate_market_data(n_firms=N_FIRMS, n_periods=max(n_rows // N_FIRMS, 1), seed=0)
+
+
+def _peak_mib(func, df):
+    tracemalloc.start()
+    try:
+        func(df)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+# n_rows varies slowest, so _data generates each size once for all metrics.
+@pytest.mark.parametrize("metric", list(CALLS))
+@pytest.mark.parametrize("n_rows", SIZES, ids=lambda n: f"{n:.0e}")
+def test_metric(benchmark, metric, n_rows):
+    if n_rows > MAX_ROWS:
+        pytest.skip(f"{n_rows} rows > MCM_BENCH_MAX_ROWS={MAX_ROWS}")
+    df = _data(n_rows)
+    func = CALLS[metric]
+    benchmark.group = metric
+    benchmark.extra_info["rows"] = len(df)
+    benchmark.extra_info["peak_mib"] = round(_peak_mib(func, df), 2)
+    benchmark.pedantic(func, args=(df,), rounds=3 if n_rows >= 10**6 else 10, warmup_rounds=1)
@@ -1,5 +1,9 @@
 # market_competition_metrics/__init__.py
 
 from .market_competition_metrics import MarketCompetitionMetrics
+from ._ols import RegressionResult
+from .cache import ResultCache
+from .pipeline import compute_all
+from .state import CompetitionState
 
-__all__ = ["MarketCompetitionMetrics"]
+__all__ = ["MarketCompetitionMetrics", "RegressionResult", "CompetitionState", "compute_all", "ResultCache"]
@@ -0,0 +1,96 @@
+# ==============================================================
+# _arrow.py
+# Parquet / Arrow input for the MarketCompetitionMetrics methods.
+#
+# Methods decorated with `columnar` also accept a Parquet path
+# (file or hive-partitioned directory), a pyarrow Dataset or an
+# Arrow Table. Only the columns named in the call are read, files
+# are memory-mapped, and `filters=` prunes partitions and row
+# groups before anything is decoded. pyarrow is optional and
+# imported on first use.
+# ==============================================================
+
+import functools
+import inspect
+import os
+
+import pandas as pd
+
+from .instrumentation import stage
+
+
+def _column_args(signature):
+    """Arguments of a method that name the columns it reads."""
+    return [name for name in signature.parameters if name.endswith(("_col", "_cols")) or name == "cluster"]
+
+
+def _filter_expression(filters):
+    if filters is None:
+        return None
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    return filters if isinstance(filters, pc.Expression) else pq.filters_to_expression(filters)
+
+
+def read_columns(source, columns, filters=None):
+    """
+    Load only ``columns`` of a columnar source into a DataFrame.
+
+    Parameters:
+        source: pd.DataFrame (returned unchanged), Parquet path, pyarrow
+            Dataset, or pyarrow Table / RecordBatch
+        columns (list): columns to read
+        filters: pyarrow filter expression or list of (column, op, value)
+            tuples, e.g. [("Period", ">=", "2025-01-01")]
+
+    Returns:
+        pd.DataFrame: the selected columns; numeric columns without nulls share
+            memory with the Arrow buffers, partition keys become categoricals
+    """
+    if isinstance(source, pd.DataFrame):
+        if filters is not None:
+            raise ValueError("filters apply to Parquet or Arrow input, not to a DataFrame")
+        return source
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    columns = list(dict.fromkeys(columns))
+    with stage("read", columns=len(columns)) as st:
+        if isinstance(source, (str, os.PathLike)):
+            table = pq.read_table(source, columns=columns, filters=filters, memory_map=True)
+        elif isinstance(source, ds.Dataset):
+            table = source.to_table(columns=columns, filter=_filter_expression(filters))
+        elif isinstance(source, (pa.Table, pa.RecordBatch)):
+            table = source.select(columns)
+            if filters is not None:
+                table = table.filter(_filter_expression(filters))
+        else:
+            raise TypeError(f"unsupported data source: {type(source).__name__}")
+        st.set(rows=table.num_rows)
+        return table.to_pandas(split_blocks=True)
+
+
+def columnar(func):
+    """Decorator letting ``data`` be a Parquet / Arrow source (see read_columns)."""
+    signature = inspect.signature(func)
+    column_args = _column_args(signature)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        data = args[0] if args else kwargs.get("data")
+        if isinstance(data, pd.DataFrame) and kwargs.get("filters") is None:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        columns = []
+        for name in column_args:
+            value = bound.arguments.get(name)
+            if value is not None:
+                columns.extend(value if isinstance(value, (list, tuple)) else [value])
+        bound.arguments["data"] = read_columns(bound.arguments["data"], columns, bound.arguments.get("filters"))
+        bound.arguments.pop("filters", None)
+        return func(*bound.args, **bound.kwargs)
+
+    return wrapper
@@ -0,0 +1,156 @@
+# ==============================================================
+# _bootstrap.py
+# Batched bootstrap replicates, resampling rows within each group.
+#
+# Replicates are drawn as a (replicates x rows) matrix of resample
+# positions and evaluated with bincount over (replicate, group)
+# pairs; regressions go through one batched normal-equation solve.
+# Draws come from a counter-based hash of (seed, group label,
+# replicate, draw), so a seed gives the same replicates whichever
+# way groups are split across worker processes, and whichever other
+# groups a call includes.
+# ==============================================================
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from ._ols import group_slices, solve_moments
+
+
+# Upper bound on resampled values held at once (replicates x rows).
+_BLOCK_ELEMENTS = 1 << 22
+
+_MASK = (1 << 64) - 1
+
+
+def new_seed(seed=None):
+    """A 64-bit integer seed; a fresh random one if ``seed`` is None."""
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    return int(seed) & _MASK
+
+
+def label_ids(keys, codes):
+    """
+    Hash of each row's group label, used to key the draws (rows with code -1
+    get an arbitrary value; they are never drawn).
+    """
+    hashed = pd.util.hash_pandas_object(keys).to_numpy()
+    return hashed[codes]
+
+
+def _splitmix64(x):
+    """SplitMix64 finalizer of a uint64 array (into a new array)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def _blocks(replicates, n_rows):
+    step = max(1, _BLOCK_ELEMENTS // max(n_rows, 1))
+    for start in range(0, replicates, step):
+        yield np.arange(start, min(start + step, replicates), dtype=np.uint64)
+
+
+def _resample(group_ids, codes, n_groups, replicates, seed):
+    """
+    Yield (reps, flat, picks) per block of replicates: ``reps`` are the
+    replicate numbers, ``picks`` the resampled rows (codes >= 0 only) and
+    ``flat`` the (replicate within the block) * n_groups + group bin of each draw.
+    """
+    order, bounds = group_slices(codes, n_groups)
+    rows = order[bounds[0]:]
+    sorted_codes = codes[rows]
+    starts = bounds[:-1][sorted_codes] - bounds[0]
+    sizes = np.diff(bounds)[sorted_codes].astype(np.uint64)
+    draw = (np.arange(len(rows)) - starts).astype(np.uint64) * np.uint64(0xD1B54A32D192ED03)
+    first_rows = order[np.minimum(bounds[:-1], len(order) - 1)] if len(order) else np.zeros(n_groups, np.intp)
+    group_keys = _splitmix64(group_ids[first_rows].astype(np.uint64) ^ np.uint64(seed))
+
+    for reps in _blocks(replicates, len(rows)):
+        # One key per (replicate, group), then one hash per draw.
+        keys = _splitmix64(group_keys[None, :] + reps[:, None] * np.uint64(0x9E3779B97F4A7C15))
+        hashed = _splitmix64(keys[:, sorted_codes] + draw[None, :])
+        # Lemire's multiply-shift maps the top 32 bits onto [0, size).
+        offsets = ((hashed >> np.uint64(32)) * sizes) >> np.uint64(32)
+        picks = rows[starts + offsets.astype(np.intp)]
+        flat = np.arange(len(reps))[:, None] * n_groups + sorted_codes[None, :]
+        yield reps, flat, picks
+
+
+def bootstrap_sums(term, group_ids, codes, n_groups, replicates, seed):
+    """
+    Per-group sums of a row-level term over bootstrap resamples (NaN terms
+    count as zero, as in the point estimates).
+
+    Parameters:
+        term (np.ndarray): row-level values (e.g. s_i^2)
+        group_ids (np.ndarray): label hash of each row's group (see label_ids), keys the draws
+        codes, n_groups: as in map_groups
+        replicates (int): number of resamples
+        seed (int): see new_seed
+
+    Returns:
+        np.ndarray: (n_groups, replicates) replicate sums
+    """
+    term = np.where(np.isnan(term), 0.0, term)
+    out = np.empty((replicates, n_groups))
+    for reps, flat, picks in _resample(group_ids, codes, n_groups, replicates, seed):
+        sums = np.bincount(flat.ravel(), weights=term[picks].ravel(), minlength=len(reps) * n_groups)
+        out[reps.astype(np.intp)] = sums.reshape(len(reps), n_groups)
+    return out.T
+
+
+def bootstrap_ols(X, y, group_ids, codes, n_groups, replicates, seed):
+    """
+    Slopes of ``y = b0 + X b`` per group over bootstrap resamples.
+
+    Rows are centred on their group means first (slopes are unchanged), so
+    the raw moments of each resample are accumulated without cancellation.
+
+    Returns:
+        np.ndarray: (n_groups, replicates, k) slopes, NaN for degenerate resamples
+    """
+    keep = codes >= 0
+    nobs = np.maximum(np.bincount(codes[keep], minlength=n_groups), 1)
+    k = X.shape[1]
+    Z = np.column_stack([X, y]).astype(float)
+    for j in range(k + 1):
+        means = np.bincount(codes[keep], weights=Z[keep, j], minlength=n_groups) / nobs
+        Z[:, j] -= means[np.where(keep, codes, 0)]
+
+    p = k + 2  # [1, X, y] moments
+    out = np.empty((replicates, n_groups, k))
+    for reps, flat, picks in _resample(group_ids, codes, n_groups, replicates, seed):
+        size = len(reps) * n_groups
+        flat = flat.ravel()
+        sample = Z[picks.ravel()]
+        moments = np.empty((size, p, p))
+        moments[:, 0, 0] = np.bincount(flat, minlength=size)
+        columns = [None] + [sample[:, j] for j in range(k + 1)]
+        for i in range(1, p):
+            moments[:, 0, i] = moments[:, i, 0] = np.bincount(flat, weights=columns[i], minlength=size)
+            for j in range(i, p):
+                moments[:, i, j] = moments[:, j, i] = np.bincount(
+                    flat, weights=columns[i] * columns[j], minlength=size
+                )
+        fit = solve_moments(moments[:, :-1, :-1], moments[:, :-1, -1], moments[:, -1, -1], inference=False)
+        out[reps.astype(np.intp)] = fit["params"][:, 1:].reshape(len(reps), n_groups, k)
+    return out.transpose(1, 0, 2)
+
+
+def percentile_interval(replicates, ci):
+    """(low, high) percentile bounds along the last axis, ignoring NaN replicates."""
+    if replicates.shape[0] == 0:  # no groups
+        return np.empty(0), np.empty(0)
+    tail = (1 - ci) / 2 * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN groups give NaN bounds
+        low, high = np.nanpercentile(replicates, [tail, 100 - tail], axis=-1)
+    return low, high
@@ -0,0 +1,95 @@
+# ==============================================================
+# _merger.py
+# Pairwise merger screening on market shares.
+#
+# Merging firms i and j raises the HHI of their market by
+# 2 * s_i * s_j. With shares sorted in decreasing order within each
+# group, the partners j of i that clear a threshold t form a prefix
+# of the group (s_j > t / (2 s_i)), so the qualifying pairs are
+# counted with one sorted merge and only those pairs are built.
+# ==============================================================
+
+import numpy as np
+
+from .instrumentation import stage
+
+
+def _count_above(values, value_codes, queries, query_codes):
+    """
+    For each query, the number of values of the same group that are strictly
+    greater than it. ``values`` must be sorted decreasing within each group.
+    """
+    n_values = len(values)
+    keys = np.concatenate([-values, -queries])
+    groups = np.concatenate([value_codes, query_codes])
+    # Queries sort before values with an equal key, so ties do not count.
+    is_value = np.concatenate([np.ones(n_values, dtype=bool), np.zeros(len(queries), dtype=bool)])
+    order = np.lexsort((is_value, keys, groups))
+    seen = np.cumsum(is_value[order])
+    group_start = np.searchsorted(value_codes, query_codes)
+    counts = np.empty(len(queries), dtype=np.intp)
+    query_rank = order >= n_values
+    counts[order[query_rank] - n_values] = seen[query_rank]
+    return counts - group_start
+
+
+def screen_pairs(shares, codes, n_groups, delta_threshold=None, hhi_threshold=None, top_k=None):
+    """
+    Firm pairs whose merger clears the screening thresholds, per group.
+
+    Parameters:
+        shares (np.ndarray): one share per firm and group
+        codes (np.ndarray): group of each share (-1 rows and NaN shares are ignored)
+        n_groups (int): number of groups
+        delta_threshold (float): keep pairs with ΔHHI above this (None: no bound)
+        hhi_threshold (float): keep pairs with post-merger HHI above this (None: no bound)
+        top_k (int): keep only the k largest ΔHHI per group (None: all)
+
+    Returns:
+        dict: "first" and "second" (row positions, the first having the larger
+            share), "group", "delta" (ΔHHI) and "hhi" (pre-merger HHI of the
+            group, one value per group), pairs sorted by group then decreasing ΔHHI
+    """
+    keep = np.flatnonzero((codes >= 0) & ~np.isnan(shares))  # NaN shares are skipped, as in hhi()
+    hhi = np.bincount(codes[keep], weights=shares[keep] ** 2, minlength=n_groups)
+
+    # Shares sorted decreasing inside each group; ranks within the group.
+    order = keep[np.lexsort((-shares[keep], codes[keep]))]
+    s, g = shares[order], codes[order]
+    starts = np.searchsorted(g, np.arange(n_groups))
+    rank = np.arange(len(order)) - starts[g]
+
+    threshold = np.full(n_groups, -np.inf)
+    if delta_threshold is not None:
+        threshold = np.maximum(threshold, delta_threshold)
+    if hhi_threshold is not None:
+        threshold = np.maximum(threshold, hhi_threshold - hhi)
+
+    with stage("pairs", rows=len(order), groups=n_groups) as st:
+        t = threshold[g]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            partner_floor = np.where(s > 0, t / (2 * s), np.where(t < 0, -np.inf, np.inf))
+        # Partners of i are the ranks i+1 .. prefix-1 of its group.
+        prefix = _count_above(s, g, partner_floor, g)
+        n_partners = np.maximum(prefix - rank - 1, 0)
+        if top_k is not None:
+            # A pair (i, j) with rank i >= k is beaten by the k pairs (0, 1..k),
+            # and j can be at most k ranks below i for the same reason.
+            n_partners = np.where(rank < top_k, np.minimum(n_partners, top_k), 0)
+
+        total = int(n_partners.sum())
+        first = np.repeat(np.arange(len(order)), n_partners)
+        offsets = np.arange(total) - np.repeat(np.cumsum(n_partners) - n_partners, n_partners)
+        second = first + 1 + offsets
+        delta = 2 * s[first] * s[second]
+        group = g[first]
+
+        ranking = np.lexsort((-delta, group))
+        first, second, delta, group = first[ranking], second[ranking], delta[ranking], group[ranking]
+        if top_k is not None:
+            pair_rank = np.arange(total) - np.searchsorted(group, group)
+            within = pair_rank < top_k
+            first, second, delta, group = first[within], second[within], delta[within], group[within]
+        st.set(pairs=len(delta))
+
+    return {"first": order[first], "second": order[second], "group": group, "delta": delta, "hhi": hhi}
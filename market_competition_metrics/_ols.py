@@ -0,0 +1,549 @@
+# ==============================================================
+# _ols.py
+# Grouped ordinary least squares used by the regression-based
+# indicators (Panzar-Rosse H-statistic and Boone indicator).
+#
+# Every group (period) is solved at once from per-group centred
+# cross-products instead of running one statsmodels fit per group.
+# Groups whose design is rank deficient, or too ill-conditioned for
+# the normal equations, are solved together by a batched SVD of
+# their rows, which reveals the rank and gives the minimum-norm
+# (pinv) solution that statsmodels would return.
+# ==============================================================
+
+from collections.abc import ItemsView, KeysView, ValuesView
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import stage
+
+
+# Groups whose centred X'X has a smaller eigenvalue ratio than this are
+# handed to the SVD solver instead of the batched normal equations.
+_EIG_RTOL = np.sqrt(np.finfo(float).eps)
+
+
+def group_codes(data, period_col):
+    """
+    Factorize the grouping column(s) once.
+
+    Parameters:
+        data (pd.DataFrame): dataset
+        period_col (str or list): column with periods, a list of grouping
+            columns (e.g. ["Market", "Period"]), or None for a single group
+
+    Returns:
+        tuple: (keys, codes) where keys is a pd.Index (a MultiIndex for several
+            columns) of the sorted group labels, in the same order as
+            ``data.groupby(period_col)``, and codes the group index of each row
+            (-1 for rows with a missing key, which groupby drops as well)
+    """
+    with stage("group", rows=len(data)) as st:
+        keys, codes = _factorize_keys(data, period_col)
+        st.set(groups=len(keys))
+    return keys, codes
+
+
+def _factorize_keys(data, period_col):
+    if period_col is None:
+        return pd.Index([None]), np.zeros(len(data), dtype=np.intp)
+    if isinstance(period_col, (list, tuple)) and len(period_col) == 1:
+        period_col = period_col[0]
+    if not isinstance(period_col, (list, tuple)):
+        codes, keys = pd.factorize(data[period_col], sort=True)
+        return pd.Index(keys, name=period_col), codes
+
+    factors = [pd.factorize(data[col], sort=True) for col in period_col]
+    valid = np.logical_and.reduce([codes >= 0 for codes, _ in factors])
+    sizes = [len(uniques) for _, uniques in factors]
+    flat = np.ravel_multi_index([codes[valid] for codes, _ in factors], sizes)
+    observed, inverse = np.unique(flat, return_inverse=True)
+    levels = np.unravel_index(observed, sizes)
+    keys = pd.MultiIndex.from_arrays(
+        [uniques.take(level) for (_, uniques), level in zip(factors, levels)], names=list(period_col)
+    )
+    codes = np.full(len(data), -1, dtype=np.intp)
+    codes[valid] = inverse
+    return keys, codes
+
+
+def float_dtype(low_memory):
+    """float32 buffers in low-memory mode, float64 otherwise."""
+    return np.float32 if low_memory else np.float64
+
+
+def log_design(data, cols, dtype=np.float64):
+    """
+    Return ``np.log`` of the given columns as one 2-D array.
+
+    Each column is logged straight into a single column-major buffer, so no
+    wide intermediate copy of ``data[cols]`` is made.
+    """
+    with stage("log", rows=len(data), columns=len(cols)):
+        out = np.empty((len(data), len(cols)), dtype=dtype, order="F")
+        for j, col in enumerate(cols):
+            np.log(data[col].to_numpy(dtype=dtype), out=out[:, j])
+        return out
+
+
+def log_column(data, col, dtype=np.float64):
+    """Return ``np.log`` of one column as a 1-D array."""
+    with stage("log", rows=len(data), columns=1):
+        values = data[col].to_numpy(dtype=dtype, copy=True)
+        return np.log(values, out=values)
+
+
+def group_slices(codes, n_groups):
+    """
+    Return (order, bounds) such that ``order[bounds[g]:bounds[g + 1]]`` are the
+    row positions of group g, in their original order.
+    """
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    return order, bounds
+
+
+def fit_statsmodels(X, y, xnames, yname):
+    """
+    Fit one group with statsmodels, labelling the design the same way the
+    per-period ``sm.OLS(np.log(y), sm.add_constant(np.log(X)))`` fit did.
+    statsmodels is imported here, on first use, to keep package import fast.
+    """
+    import statsmodels.api as sm
+
+    exog = sm.add_constant(pd.DataFrame(np.asarray(X, dtype=float), columns=list(xnames)), has_constant="add")
+    endog = pd.Series(np.asarray(y, dtype=float), name=yname)
+    return sm.OLS(endog, exog).fit()
+
+
+class RegressionResult(dict):
+    """
+    Result of one group's regression.
+
+    Dict access works as before (``res["H"]``, ``res["Boone"]``,
+    ``res["coefficients"]``, ``res["summary"]``), but the statsmodels summary
+    is only built the first time ``"summary"`` is read. ``"summary"`` is still
+    listed by ``keys()``, iteration and ``len()``; reading it through
+    ``items()``, ``values()`` or ``dict(res)`` builds it. The raw estimates are
+    available as attributes:
+
+        - params (np.ndarray): coefficients, intercept first
+        - bse (np.ndarray or None): standard errors, None if inference was skipped
+        - nobs (int): number of observations
+        - df_resid (int or None): residual degrees of freedom
+        - rank (int or None): numerical rank of the design, intercept included
+        - cond (float or None): condition number of the design
+    """
+
+    __slots__ = ("params", "bse", "nobs", "df_resid", "rank", "cond", "_summary")
+
+    def __init__(self, values, params, bse, nobs, summary=None, df_resid=None, rank=None, cond=None):
+        super().__init__(values)
+        self.params = params
+        self.bse = bse
+        self.nobs = nobs
+        self.df_resid = df_resid
+        self.rank = rank
+        self.cond = cond
+        self._summary = summary  # callable building the summary, or None
+
+    def __missing__(self, key):
+        if key == "summary" and self._summary is not None:
+            value = self["summary"] = self._summary()
+            self._summary = None
+            return value
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return super().__contains__(key) or (key == "summary" and self._summary is not None)
+
+    def __iter__(self):
+        yield from super().__iter__()
+        if self._summary is not None:
+            yield "summary"
+
+    def __len__(self):
+        return super().__len__() + (self._summary is not None)
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __reduce__(self):
+        # Copies and pickles keep the summary, built or not: a pending builder
+        # (GroupSummary) only carries this group's rows along.
+        bse = None if self.bse is None else np.array(self.bse)
+        return (type(self), (dict(super().items()), np.array(self.params), bse, self.nobs, self._summary,
+                             self.df_resid, self.rank, self.cond))
+
+
+def group_result(fit, g, values, summary=None):
+    """Wrap group g of a :func:`grouped_ols` fit in a :class:`RegressionResult`."""
+    bse = None if fit["bse"] is None else fit["bse"][g]
+    extra = {key: fit[key][g].item() for key in ("df_resid", "rank", "cond") if key in fit}
+    return RegressionResult(values, fit["params"][g], bse, int(fit["nobs"][g]), summary, **extra)
+
+
+class GroupSummary:
+    """
+    Zero-argument callable that fits one group with statsmodels and returns
+    ``model.summary()``.
+
+    It references the design arrays of the whole call; copies and pickles
+    keep only the group's own rows.
+    """
+
+    __slots__ = ("X", "y", "rows", "xnames", "yname")
+
+    def __init__(self, X, y, rows, xnames, yname):
+        self.X = X
+        self.y = y
+        self.rows = rows
+        self.xnames = xnames
+        self.yname = yname
+
+    def __call__(self):
+        with stage("summary", rows=len(self.rows)):
+            return fit_statsmodels(self.X[self.rows], self.y[self.rows], self.xnames, self.yname).summary()
+
+    def __reduce__(self):
+        rows = np.arange(len(self.rows))
+        return (type(self), (self.X[self.rows], self.y[self.rows], rows, list(self.xnames), self.yname))
+
+
+def summary_builders(X, y, codes, n_groups, xnames, yname):
+    """
+    Return a function mapping a group index to a zero-argument callable
+    (a :class:`GroupSummary`) that fits that group with statsmodels and
+    returns ``model.summary()``.
+    """
+    order, bounds = group_slices(codes, n_groups)
+
+    def builder(g):
+        return GroupSummary(X, y, order[bounds[g]:bounds[g + 1]], xnames, yname)
+
+    return builder
+
+
+def _solve_centred(sxx, sxy, syy, x_mean, y_mean, nobs, inference):
+    """
+    Batched solve from centred moments.
+
+    Returns (params, bse, solvable); params and bse are NaN for groups that are
+    rank deficient, too ill-conditioned for the normal equations, or whose
+    moments are not finite.
+    """
+    n_groups, k = sxy.shape
+    finite = _finite_groups(sxx, sxy, syy)
+    eig = np.full((n_groups, k), np.nan)
+    eig[finite] = np.linalg.eigvalsh(sxx[finite])
+    solvable = finite & (nobs > k) & (eig[:, 0] > eig[:, -1] * _EIG_RTOL) & (eig[:, -1] > 0)
+
+    params = np.full((n_groups, k + 1), np.nan)
+    bse = np.full((n_groups, k + 1), np.nan) if inference else None
+    if solvable.any():
+        slopes = np.linalg.solve(sxx[solvable], sxy[solvable][..., None])[..., 0]
+        params[solvable, 1:] = slopes
+        params[solvable, 0] = y_mean[solvable] - np.einsum("gk,gk->g", x_mean[solvable], slopes)
+
+        if inference:
+            rss = np.maximum(syy[solvable] - np.einsum("gk,gk->g", slopes, sxy[solvable]), 0.0)
+            df_resid = nobs[solvable] - k - 1
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.where(df_resid > 0, rss / df_resid, np.nan)
+            inv = np.linalg.inv(sxx[solvable])
+            xm = x_mean[solvable]
+            bse[solvable, 1:] = np.sqrt(scale[:, None] * np.diagonal(inv, axis1=1, axis2=2))
+            bse[solvable, 0] = np.sqrt(
+                scale * (1.0 / nobs[solvable] + np.einsum("gi,gij,gj->g", xm, inv, xm))
+            )
+
+    return params, bse, solvable
+
+
+def _finite_groups(sxx, sxy, syy=None):
+    """
+    Groups whose moments are all finite. A non-finite value in any row (e.g.
+    the log of a zero cost) spreads to its group's moments, which would make
+    the batched eigen-decomposition fail for every group.
+    """
+    finite = np.isfinite(sxx).all(axis=(1, 2)) & np.isfinite(sxy).all(axis=1)
+    return finite if syy is None else finite & np.isfinite(syy)
+
+
+def cross_products(X, y, codes, n_groups):
+    """
+    Per-group raw moments of the design ``Z = [1, X]``.
+
+    These are additive across rows, so moments of disjoint row sets can be
+    summed (or subtracted) before solving with :func:`solve_moments`.
+
+    Returns:
+        tuple: (ztz, zty, yty) with shapes (n_groups, k + 1, k + 1),
+            (n_groups, k + 1) and (n_groups,); ``ztz[:, 0, 0]`` is nobs
+    """
+    keep = codes >= 0
+    if not keep.all():
+        X, y, codes = X[keep], y[keep], codes[keep]
+    Z = np.column_stack([np.ones(len(y)), X])
+    p = Z.shape[1]
+
+    ztz = np.empty((n_groups, p, p))
+    for i in range(p):
+        for j in range(i, p):
+            ztz[:, i, j] = ztz[:, j, i] = np.bincount(codes, weights=Z[:, i] * Z[:, j], minlength=n_groups)
+    zty = np.column_stack([np.bincount(codes, weights=Z[:, j] * y, minlength=n_groups) for j in range(p)])
+    yty = np.bincount(codes, weights=y * y, minlength=n_groups)
+    return ztz, zty, yty
+
+
+def solve_moments(ztz, zty, yty, inference=True):
+    """
+    Solve every group from raw moments produced by :func:`cross_products`.
+
+    Without the underlying rows there is no statsmodels fallback: groups that
+    are rank deficient get NaN estimates.
+
+    Returns:
+        dict: "params", "bse", "nobs" as in :func:`grouped_ols`, plus "solvable"
+    """
+    nobs = ztz[:, 0, 0]
+    denom = np.maximum(nobs, 1)
+    x_mean = ztz[:, 0, 1:] / denom[:, None]
+    y_mean = zty[:, 0] / denom
+    sxx = ztz[:, 1:, 1:] - nobs[:, None, None] * x_mean[:, :, None] * x_mean[:, None, :]
+    sxy = zty[:, 1:] - nobs[:, None] * x_mean * y_mean[:, None]
+    syy = yty - nobs * y_mean ** 2
+
+    params, bse, solvable = _solve_centred(sxx, sxy, syy, x_mean, y_mean, nobs, inference)
+    return {"params": params, "bse": bse, "nobs": nobs.astype(np.intp), "solvable": solvable}
+
+
+def rolling_ols(X, y, codes, n_groups, window, min_periods=None, breaks=None):
+    """
+    Solve ``y = b0 + X b`` over rolling windows of consecutive groups.
+
+    Per-group moments are computed once and windows are formed from their
+    cumulative sums, so each window costs O(1) moment additions regardless of
+    its length. Data are shifted by the mean of their finite rows first so
+    that the cumulative sums do not lose precision.
+
+    Parameters:
+        X, y, codes, n_groups: as in grouped_ols (groups in period order)
+        window (int): number of consecutive groups per window
+        min_periods (int): smallest number of groups for a leading window
+            (defaults to ``window``, i.e. only full windows)
+        breaks (np.ndarray): (n_groups,) bool, True where a group starts a new
+            series (e.g. the first period of a market); windows never span a
+            break and each series has its own leading windows
+
+    Returns:
+        dict: "start" and "end" group index of each window, and "params",
+            "nobs" as in grouped_ols (NaN params for degenerate windows or
+            windows containing non-finite values; nobs still counts every row
+            of the window)
+    """
+    if window < 1:
+        raise ValueError("window must be a positive number of periods")
+    min_periods = window if min_periods is None else min_periods
+
+    keep = codes >= 0
+    # Only finite rows set the shift: one log of a zero cost must not make
+    # every row, and so every window, non-finite.
+    finite = keep & np.isfinite(X).all(axis=1) & np.isfinite(y)
+    x_shift = X[finite].mean(axis=0) if finite.any() else np.zeros(X.shape[1])
+    y_shift = y[finite].mean() if finite.any() else 0.0
+    counts = np.bincount(codes[keep], minlength=n_groups)
+    with np.errstate(invalid="ignore"):
+        ztz, zty, yty = cross_products(X - x_shift, y - y_shift, codes, n_groups)
+
+    # Non-finite rows (e.g. log of a zero cost) would poison every later
+    # cumulative sum: zero them out and invalidate the windows instead.
+    bad = ~(np.isfinite(ztz).all(axis=(1, 2)) & np.isfinite(zty).all(axis=1) & np.isfinite(yty))
+    ztz[bad], zty[bad], yty[bad] = 0.0, 0.0, 0.0
+
+    def _cum(a):
+        return np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+
+    # First group of the series each group belongs to.
+    first = np.zeros(n_groups, dtype=np.intp)
+    if breaks is not None:
+        first = np.maximum.accumulate(np.where(breaks, np.arange(n_groups), 0))
+    end = np.arange(n_groups)
+    start = np.maximum(end - window + 1, first)
+    full = end - start + 1 >= max(min_periods, 1)
+    start, end = start[full], end[full]
+    c_ztz, c_zty, c_yty, c_bad = _cum(ztz), _cum(zty), _cum(yty), _cum(bad.astype(float))
+    c_counts = np.concatenate([[0], np.cumsum(counts)])
+
+    fit = solve_moments(
+        c_ztz[end + 1] - c_ztz[start],
+        c_zty[end + 1] - c_zty[start],
+        c_yty[end + 1] - c_yty[start],
+        inference=False,
+    )
+    params = fit["params"]
+    params[(c_bad[end + 1] - c_bad[start]) > 0] = np.nan
+    params[:, 0] += y_shift - params[:, 1:] @ x_shift
+    nobs = (c_counts[end + 1] - c_counts[start]).astype(np.intp)
+    return {"start": start, "end": end, "params": params, "nobs": nobs}
+
+
+def grouped_ols(X, y, codes, n_groups, inference=True):
+    """
+    Solve ``y = b0 + X b`` independently for every group.
+
+    Parameters:
+        X (np.ndarray): (n, k) regressors (already log-transformed)
+        y (np.ndarray): (n,) dependent variable (already log-transformed)
+        codes (np.ndarray): (n,) group index of each row, -1 to skip a row
+        n_groups (int): number of groups
+        inference (bool): if False, skip the standard errors
+
+    Returns:
+        dict:
+            - "params": (n_groups, k + 1) array, intercept first
+            - "bse": (n_groups, k + 1) standard errors, or None if inference=False
+            - "nobs": (n_groups,) number of observations per group
+            - "fallback": (n_groups,) bool, True where the SVD solver was used
+            - "rank": (n_groups,) numerical rank of [1, X]
+            - "df_resid": (n_groups,) residual degrees of freedom, nobs - rank
+            - "cond": (n_groups,) condition number of [1, X], as statsmodels'
+              ``condition_number`` (NaN for empty groups)
+            - "degenerate": (n_groups,) bool, True for rank deficient groups
+              and groups without residual degrees of freedom; their params
+              are the minimum-norm solution and their bse NaN where undefined.
+              Groups with a non-finite value are degenerate too, with rank 0
+              and NaN params, bse and cond.
+    """
+    with stage("solve", rows=len(y), groups=n_groups):
+        return _grouped_ols(X, y, codes, n_groups, inference)
+
+
+def _grouped_ols(X, y, codes, n_groups, inference):
+    keep = codes >= 0
+    if not keep.all():
+        X, y, codes = X[keep], y[keep], codes[keep]
+    n, k = X.shape
+
+    nobs = np.bincount(codes, minlength=n_groups)
+    denom = np.maximum(nobs, 1)
+    x_mean = np.column_stack(
+        [np.bincount(codes, weights=X[:, j], minlength=n_groups) for j in range(k)]
+    ) / denom[:, None]
+    y_mean = np.bincount(codes, weights=y, minlength=n_groups) / denom
+
+    # Centring within each group keeps the normal equations well conditioned
+    # and drops the intercept from the system. Column by column, in the input
+    # dtype, so float32 inputs keep float32 temporaries; sums are float64.
+    # Non-finite rows (inf - inf) only turn their own group's moments to NaN.
+    with np.errstate(invalid="ignore"):
+        Xc = np.empty_like(X, order="F")
+        for j in range(k):
+            np.subtract(X[:, j], x_mean[codes, j], out=Xc[:, j], casting="same_kind")
+        yc = np.empty_like(y)
+        np.subtract(y, y_mean[codes], out=yc, casting="same_kind")
+
+        sxx = np.empty((n_groups, k, k))
+        for i in range(k):
+            for j in range(i, k):
+                sxx[:, i, j] = sxx[:, j, i] = np.bincount(
+                    codes, weights=Xc[:, i] * Xc[:, j], minlength=n_groups
+                )
+        sxy = np.column_stack(
+            [np.bincount(codes, weights=Xc[:, j] * yc, minlength=n_groups) for j in range(k)]
+        )
+
+        syy = np.bincount(codes, weights=yc * yc, minlength=n_groups) if inference else None
+
+    params, bse, solvable = _solve_centred(sxx, sxy, syy, x_mean, y_mean, nobs, inference)
+    finite = _finite_groups(sxx, sxy, syy)
+    rank = np.where(solvable, k + 1, 0)
+    cond = _design_condition(sxx, x_mean, nobs, finite)
+
+    # Groups with non-finite values keep NaN estimates and are flagged degenerate.
+    fallback = ~solvable & finite & (nobs > 0)
+    if fallback.any():
+        _solve_svd(X, y, codes, n_groups, np.flatnonzero(fallback), params, bse, rank, cond)
+
+    df_resid = nobs - rank
+    return {
+        "params": params, "bse": bse, "nobs": nobs, "fallback": fallback,
+        "rank": rank, "df_resid": df_resid, "cond": cond,
+        "degenerate": (rank < k + 1) | (df_resid <= 0),
+    }
+
+
+def _design_condition(sxx, x_mean, nobs, finite):
+    """Condition number of each group's design [1, X] (statsmodels' condition_number)."""
+    n_groups, k = x_mean.shape
+    ztz = np.empty((n_groups, k + 1, k + 1))
+    ztz[:, 0, 0] = nobs
+    ztz[:, 0, 1:] = ztz[:, 1:, 0] = nobs[:, None] * x_mean
+    ztz[:, 1:, 1:] = sxx + nobs[:, None, None] * x_mean[:, :, None] * x_mean[:, None, :]
+    eig = np.full((n_groups, k + 1), np.nan)
+    eig[finite] = np.linalg.eigvalsh(ztz[finite])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cond = np.sqrt(eig[:, -1] / np.maximum(eig[:, 0], 0.0))
+    return np.where(nobs > 0, cond, np.nan)
+
+
+def _solve_svd(X, y, codes, n_groups, groups, params, bse, rank, cond):
+    """
+    Solve the given groups with a batched SVD of their design [1, X], in place.
+
+    Groups are padded with zero rows (which leave least-squares solutions
+    unchanged) to the next power of two of their size, so each size class
+    is a single stacked ``np.linalg.svd`` call however many groups it holds.
+    Singular values below ``max(n, k + 1) * eps * s_max`` are treated as
+    zero, as in ``np.linalg.matrix_rank``.
+    """
+    order, bounds = group_slices(codes, n_groups)
+    sizes = bounds[groups + 1] - bounds[groups]
+    padded = 1 << np.ceil(np.log2(sizes)).astype(int)
+    p = X.shape[1] + 1
+
+    with stage("svd", groups=len(groups)):
+        for m in np.unique(padded):
+            members, lens = groups[padded == m], sizes[padded == m]
+            slot = np.repeat(np.arange(len(members)), lens)
+            within = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens)
+            rows = order[np.repeat(bounds[members], lens) + within]
+
+            Z = np.zeros((len(members), m, p))
+            Y = np.zeros((len(members), m))
+            Z[slot, within, 0] = 1.0
+            Z[slot, within, 1:] = X[rows]
+            Y[slot, within] = y[rows]
+
+            U, sv, Vt = np.linalg.svd(Z, full_matrices=False)
+            tol = sv[:, :1] * np.maximum(lens, p)[:, None] * np.finfo(float).eps
+            kept = sv > tol
+            with np.errstate(divide="ignore"):
+                inv_sv = np.where(kept, 1.0 / sv, 0.0)
+            coef = np.einsum("gji,gj->gi", Vt, inv_sv * np.einsum("gmj,gm->gj", U, Y))
+
+            params[members] = coef
+            rank[members] = kept.sum(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cond[members] = sv[:, 0] / (sv[:, -1] if sv.shape[1] == p else 0.0)
+
+            if bse is not None:
+                resid = Y - np.einsum("gmi,gi->gm", Z, coef)
+                df_resid = lens - rank[members]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    scale = np.where(df_resid > 0, np.einsum("gm,gm->g", resid, resid) / df_resid, np.nan)
+                variance = np.einsum("gji,gj->gi", Vt ** 2, inv_sv ** 2)
+                bse[members] = np.sqrt(scale[:, None] * variance)
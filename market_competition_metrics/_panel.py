@@ -0,0 +1,111 @@
+# ==============================================================
+# _panel.py
+# Fixed-effects (within) estimator for the panel versions of the
+# Panzar-Rosse and Boone regressions.
+#
+# Firm (and optionally period) effects are absorbed by subtracting
+# group means computed with np.bincount, so no dummy columns are
+# built and every step is linear in the number of rows. With both
+# effects on an unbalanced panel, the two demeanings are alternated
+# until the means vanish (one sweep suffices for balanced panels).
+# ==============================================================
+
+import numpy as np
+
+from ._ols import _EIG_RTOL
+from .instrumentation import stage
+
+
+DEMEAN_TOL = 1e-10
+DEMEAN_MAX_ITER = 1000
+
+
+def _group_means(M, codes, counts):
+    n_groups = len(counts)
+    return np.column_stack(
+        [np.bincount(codes, weights=M[:, j], minlength=n_groups) for j in range(M.shape[1])]
+    ) / counts[:, None]
+
+
+def demean(M, effects, tol=DEMEAN_TOL, max_iter=DEMEAN_MAX_ITER):
+    """
+    Sweep the fixed effects out of the columns of ``M``.
+
+    Parameters:
+        M (np.ndarray): 2-D array, one row per observation (not modified)
+        effects (list): integer code arrays, one per fixed effect
+        tol (float): stop when no group mean exceeds tol times the data scale
+        max_iter (int): most alternating sweeps for several effects
+
+    Returns:
+        tuple: (demeaned copy of M, number of sweeps)
+    """
+    M = np.array(M, dtype=float)
+    counts = [np.maximum(np.bincount(codes), 1) for codes in effects]
+    scale = tol * max(np.abs(M).max(initial=0.0), 1.0)
+    for sweep in range(1, max_iter + 1):
+        largest = 0.0
+        for codes, n in zip(effects, counts):
+            means = _group_means(M, codes, n)
+            M -= means[codes]
+            largest = max(largest, np.abs(means).max(initial=0.0))
+        if len(effects) == 1 or largest <= scale:
+            return M, sweep
+    raise RuntimeError(f"fixed effects did not converge in {max_iter} sweeps")
+
+
+def within_ols(X, y, effects, absorbed, cluster=None, inference=True):
+    """
+    OLS of ``y`` on ``X`` with the given fixed effects absorbed.
+
+    Parameters:
+        X (np.ndarray): 2-D regressors
+        y (np.ndarray): 1-D response
+        effects (list): integer code arrays, one per fixed effect
+        absorbed (int): degrees of freedom used by the effects
+        cluster (np.ndarray): optional cluster code of each row for
+            cluster-robust standard errors (NaN with fewer than two clusters)
+        inference (bool): if False, skip standard errors
+
+    Returns:
+        dict: "params" (mean of the effects first, then the slopes), "bse"
+            (NaN for the first entry; None without inference), "nobs",
+            "df_resid" and "n_clusters"; NaN estimates if X is collinear
+            once the effects are removed
+    """
+    n, k = X.shape
+    with stage("demean", rows=n) as st:
+        W, sweeps = demean(np.column_stack([X, y]), effects)
+        st.set(sweeps=sweeps)
+    Xw, yw = W[:, :k], W[:, k]
+
+    with stage("solve", rows=n):
+        xtx = Xw.T @ Xw
+        df_resid = n - k - absorbed
+        params = np.full(k + 1, np.nan)
+        bse = np.full(k + 1, np.nan) if inference else None
+        n_clusters = None if cluster is None else int(cluster.max(initial=-1) + 1)
+
+        eig = np.linalg.eigvalsh(xtx)
+        if df_resid > 0 and eig[-1] > 0 and eig[0] > eig[-1] * _EIG_RTOL:
+            slopes = np.linalg.solve(xtx, Xw.T @ yw)
+            params[1:] = slopes
+            params[0] = y.mean() - X.mean(axis=0) @ slopes
+
+            if inference:
+                resid = yw - Xw @ slopes
+                inv = np.linalg.inv(xtx)
+                if cluster is None:
+                    cov = inv * (resid @ resid / df_resid)
+                elif n_clusters > 1:
+                    # Same small-sample correction as statsmodels' clustered
+                    # OLS with one dummy column per absorbed effect.
+                    scores = _group_means(Xw * resid[:, None], cluster, np.ones(n_clusters))
+                    correction = n_clusters / (n_clusters - 1) * (n - 1) / df_resid
+                    cov = correction * inv @ (scores.T @ scores) @ inv
+                else:
+                    cov = None  # a single cluster leaves the clustered variance undefined
+                if cov is not None:
+                    bse[1:] = np.sqrt(np.diagonal(cov))
+
+    return {"params": params, "bse": bse, "nobs": n, "df_resid": df_resid, "n_clusters": n_clusters}
@@ -0,0 +1,85 @@
+# ==============================================================
+# _parallel.py
+# Spread grouped computations across a process pool.
+#
+# Rows are reordered by group once, then split into contiguous
+# ranges of groups of roughly equal row counts. Each range is sent
+# to a worker as plain NumPy arrays (cheap to pickle) and the
+# per-range results are concatenated back in group order, so the
+# output is identical to the serial path.
+# ==============================================================
+
+import os
+
+import numpy as np
+
+from ._ols import group_slices
+from .instrumentation import stage
+
+
+# Ranges per worker: enough to balance uneven groups, few enough that
+# pickling and task dispatch stay negligible.
+_CHUNKS_PER_WORKER = 4
+
+
+def _resolve_workers(n_jobs):
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(os.cpu_count() + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def _call(func, arrays, codes, n_groups):
+    return func(*arrays, codes, n_groups)
+
+
+def map_groups(func, arrays, codes, n_groups, n_jobs=None, executor=None):
+    """
+    Evaluate ``func(*arrays, codes, n_groups)`` group-range by group-range.
+
+    Parameters:
+        func (callable): picklable module-level function returning an array
+            (or dict of arrays) with one leading entry per group
+        arrays (list): row-aligned NumPy arrays passed to func
+        codes (np.ndarray): group index of each row (-1 rows are dropped)
+        n_groups (int): number of groups
+        n_jobs (int): worker processes (-1 for all cores); ignored if executor given
+        executor (concurrent.futures.Executor): pool to reuse across calls
+
+    Returns:
+        same type as func's return value, covering all groups in order
+    """
+    workers = os.cpu_count() if executor is not None and n_jobs is None else _resolve_workers(n_jobs)
+    if (executor is None and workers == 1) or n_groups <= 1:
+        return func(*arrays, codes, n_groups)
+
+    order, bounds = group_slices(codes, n_groups)
+    n_chunks = min(n_groups, workers * _CHUNKS_PER_WORKER)
+    targets = np.linspace(0, bounds[-1], n_chunks + 1)[1:-1]
+    edges = np.unique(np.concatenate([[0], np.searchsorted(bounds, targets), [n_groups]]))
+
+    tasks = []
+    for a, b in zip(edges[:-1], edges[1:]):
+        rows = order[bounds[a]:bounds[b]]
+        tasks.append(([arr[rows] for arr in arrays], codes[rows] - a, int(b - a)))
+
+    with stage("dispatch", rows=int(bounds[-1]), groups=n_groups, tasks=len(tasks)):
+        if executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_call, *zip(*[(func,) + task for task in tasks])))
+        else:
+            parts = list(executor.map(_call, *zip(*[(func,) + task for task in tasks])))
+    return _concat(parts)
+
+
+def _concat(parts):
+    first = parts[0]
+    if isinstance(first, dict):
+        return {
+            key: None if first[key] is None else np.concatenate([part[key] for part in parts])
+            for key in first
+        }
+    return np.concatenate(parts)
@@ -0,0 +1,174 @@
+# ==============================================================
+# _plotting.py
+# Charts for the plot=True / stacked=True options.
+#
+# Interactive mode draws on a pyplot figure and calls plt.show().
+# Batch mode (plot_dir=...) draws on explicit matplotlib Figure
+# objects, never touches pyplot or its global state, and writes one
+# PNG/SVG per market. In batch mode only, long series are averaged
+# into at most MAX_POINTS buckets and stacked charts keep the
+# MAX_FIRMS largest firms, the rest being merged into "Other";
+# interactive charts show every period and firm, as before.
+# matplotlib is imported on first use only.
+# ==============================================================
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+MAX_POINTS = 500
+MAX_FIRMS = 15
+
+
+def pyplot():
+    """
+    Import matplotlib.pyplot on first use. Together with statsmodels (see
+    _ols.fit_statsmodels) it dominates import time, and most callers never plot.
+    """
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def plot_labels(keys):
+    """x-axis values for a plot over groups; "Market / Period" labels for several keys."""
+    if isinstance(keys, pd.MultiIndex):
+        return [" / ".join(map(str, key)) for key in keys]
+    return list(keys)
+
+
+def downsample(labels, values, max_points=MAX_POINTS):
+    """
+    Average ``values`` (1-D, or 2-D with one row per label) over at most
+    ``max_points`` contiguous buckets, each labelled by its last label.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(labels)
+    if max_points is None or n <= max_points:
+        return list(labels), values
+    starts = np.arange(max_points) * n // max_points
+    counts = np.diff(np.append(starts, n))
+    means = np.add.reduceat(values, starts, axis=0) / (counts if values.ndim == 1 else counts[:, None])
+    return [labels[i] for i in starts + counts - 1], means
+
+
+def merge_minor(matrix, max_firms=MAX_FIRMS):
+    """Keep the ``max_firms`` largest contributors of a firm x period matrix; sum the rest into "Other"."""
+    if max_firms is None or len(matrix) <= max_firms:
+        return matrix
+    totals = np.abs(matrix.to_numpy()).sum(axis=1)
+    top = np.zeros(len(matrix), dtype=bool)
+    top[np.argsort(-totals, kind="stable")[:max_firms]] = True
+    other = pd.DataFrame([matrix[~top].sum(axis=0)], index=["Other"])
+    return pd.concat([matrix[top], other])
+
+
+def _market_groups(keys):
+    """(market label, positions) per market: all key levels but the last (the period)."""
+    if not isinstance(keys, pd.MultiIndex):
+        return [(None, np.arange(len(keys)))]
+    markets = keys.droplevel(-1)
+    codes, uniques = pd.factorize(markets, sort=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return [
+        (" / ".join(map(str, np.atleast_1d(market))), order[bounds[i]:bounds[i + 1]])
+        for i, market in enumerate(uniques)
+    ]
+
+
+def _file_name(name, market, plot_format):
+    if market is None:
+        return f"{name}.{plot_format}"
+    return f"{name}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', market)}.{plot_format}"
+
+
+def _draw_line(ax, labels, values, title, ylabel, color, reduce=False):
+    if reduce:
+        labels, values = downsample(labels, values)
+    ax.plot(labels, values, marker="o", linestyle="-", color=color)
+    ax.set_title(title)
+    ax.set_xlabel("Period")
+    ax.set_ylabel(ylabel)
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+
+def _draw_stacked(ax, labels, matrix, reduce=False):
+    values = matrix.to_numpy().T
+    if reduce:
+        matrix = merge_minor(matrix)
+        labels, values = downsample(labels, matrix.to_numpy().T)
+    bottom = np.zeros(len(labels))
+    for firm, column in zip(matrix.index, values.T):
+        ax.bar(labels, column, bottom=bottom, label=firm)
+        bottom += column
+    ax.set_title("Firm Contributions to Market Lerner Index")
+    ax.set_xlabel("Period")
+    ax.set_ylabel("Contribution to LM")
+    ax.legend(title="Firms", bbox_to_anchor=(0.5, -0.15), loc="upper center", ncol=5)  # move legend below
+
+
+def _render(draw, figsize, name, keys, plot_dir, plot_format, tight=False):
+    """
+    Show one chart over all keys, or write one file per market to plot_dir.
+
+    ``draw(ax, positions, market)`` draws the given groups on ``ax``.
+
+    Returns:
+        list: paths of the written files (empty in interactive mode)
+    """
+    if plot_dir is None:
+        plt = pyplot()
+        fig = plt.figure(figsize=figsize)
+        draw(fig.add_subplot(), np.arange(len(keys)), None)
+        if tight:
+            fig.tight_layout()
+        plt.show()
+        return []
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    os.makedirs(plot_dir, exist_ok=True)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    paths = []
+    for market, positions in _market_groups(keys):
+        fig.clear()
+        draw(fig.add_subplot(), positions, market)
+        if tight:
+            fig.tight_layout()
+        path = os.path.join(plot_dir, _file_name(name, market, plot_format))
+        fig.savefig(path, format=plot_format)
+        paths.append(path)
+    return paths
+
+
+def plot_series(keys, values, name, title, ylabel, color, plot_dir=None, plot_format="png"):
+    """Line chart of one value per group (see _render); downsampled with plot_dir only."""
+    values = np.asarray(values, dtype=float)
+
+    def draw(ax, positions, market):
+        group_keys = keys[positions]
+        labels = plot_labels(group_keys if market is None else group_keys.get_level_values(-1))
+        _draw_line(ax, labels, values[positions], title if market is None else f"{title} ({market})",
+                   ylabel, color, reduce=plot_dir is not None)
+
+    return _render(draw, (8, 5), name, keys, plot_dir, plot_format)
+
+
+def plot_contributions(keys, matrix, name, plot_dir=None, plot_format="png"):
+    """Stacked bars of a firm x group contribution matrix (see _render); minor firms merged with plot_dir only."""
+
+    def draw(ax, positions, market):
+        group_keys = keys[positions]
+        labels = plot_labels(group_keys if market is None else group_keys.get_level_values(-1))
+        sub = matrix.iloc[:, positions]
+        _draw_stacked(ax, labels, sub.loc[(sub != 0).any(axis=1)] if market is not None else sub,
+                      reduce=plot_dir is not None)
+        if market is not None:
+            ax.set_title(f"{ax.get_title()} ({market})")
+
+    return _render(draw, (12, 6), name, keys, plot_dir, plot_format, tight=True)
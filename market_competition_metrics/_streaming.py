@@ -0,0 +1,78 @@
+# ==============================================================
+# _streaming.py
+# Chunked ingest for the additive indicators (HHI and Lerner).
+#
+# Both indices are per-period sums of a row-level term (s_i^2 and
+# s_i * L_i), so they can be accumulated chunk by chunk with memory
+# bounded by the number of periods rather than the number of rows.
+# ==============================================================
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from ._ols import group_codes
+from .instrumentation import stage
+
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def iter_chunks(source, columns, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Yield DataFrame chunks holding only ``columns``.
+
+    Parameters:
+        source: CSV or Parquet (``.parquet``) path, a DataFrame, or an iterable
+            of DataFrames with the same schema as Synthetic_Market_Data.csv
+        columns (list): columns needed by the caller
+        chunksize (int): rows per chunk when reading a file
+    """
+    columns = list(dict.fromkeys(columns))
+    if isinstance(source, (str, os.PathLike)) and os.fspath(source).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(source, memory_map=True)
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas(split_blocks=True)
+    elif isinstance(source, (str, os.PathLike)):
+        yield from pd.read_csv(source, usecols=columns, chunksize=chunksize)
+    elif isinstance(source, pd.DataFrame):
+        yield source[columns]
+    else:
+        for chunk in source:
+            yield chunk[columns]
+
+
+def stream_period_sums(source, columns, period_col, term, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Accumulate ``term(chunk)`` per period over all chunks.
+
+    Parameters:
+        source: see iter_chunks
+        columns (list): value columns read by ``term``
+        period_col (str): column for periods, or None for a single total
+        term (callable): maps a chunk to a 1-D array of row-level values
+        chunksize (int): rows per chunk when reading a CSV file
+
+    Returns:
+        float or dict: total (no period_col) or {period: total}, periods sorted
+    """
+    if period_col is None:
+        total = 0.0
+        for chunk in iter_chunks(source, columns, chunksize):
+            with stage("chunk", rows=len(chunk)):
+                total += np.nansum(term(chunk))
+        return total
+
+    totals = {}
+    for chunk in iter_chunks(source, list(columns) + [period_col], chunksize):
+        with stage("chunk", rows=len(chunk)):
+            keys, codes = group_codes(chunk, period_col)
+            values = term(chunk)
+            keep = (codes >= 0) & ~np.isnan(values)  # NaN terms are skipped, as in hhi()
+            sums = np.bincount(codes[keep], weights=values[keep], minlength=len(keys))
+            for key, value in zip(keys, sums):
+                totals[key] = totals.get(key, 0.0) + value
+    return {key: totals[key] for key in sorted(totals)}
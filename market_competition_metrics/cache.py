@@ -0,0 +1,263 @@
+# ==============================================================
+# cache.py
+# Opt-in, content-addressed cache for MarketCompetitionMetrics calls.
+#
+# Results are cached per period, keyed by a fingerprint of that
+# period's rows (only the columns the call reads) plus the call
+# arguments. Re-running a call on unchanged data is a lookup; if
+# some rows change, only the periods they belong to are recomputed.
+# Two tiers: an in-memory LRU and an optional on-disk store with
+# size-based eviction of the least recently used files. The disk
+# tier's LRU order and total size are kept in memory (the directory
+# is scanned once) and eviction runs once per call.
+# ==============================================================
+
+import copy
+import hashlib
+import inspect
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ._arrow import read_columns
+from ._bootstrap import _splitmix64
+from ._ols import group_codes, group_slices
+from .market_competition_metrics import MarketCompetitionMetrics
+
+
+# Arguments of each method that name the columns it reads.
+_COLUMN_ARGS = {
+    "hhi": ("share_col",),
+    "lerner": ("firm_col", "price_col", "cost_col", "share_col"),
+    "panzar_rosse": ("revenue_col", "input_cols"),
+    "boone": ("cost_cols", "profit_col"),
+}
+
+# Arguments that do not change the result.
+_IGNORED_ARGS = ("data", "n_jobs", "executor", "plot_dir", "plot_format")
+
+_MISSING = object()
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+class ResultCache:
+    """
+    Per-period result cache for hhi, lerner, panzar_rosse and boone.
+
+    Use the methods of this object instead of the MarketCompetitionMetrics
+    ones; they take the same arguments::
+
+        cache = ResultCache(directory="~/.cache/market_competition_metrics")
+        cache.hhi(df, share_col="Market_share", period_col="Period")
+
+    Calls with plot=True or stacked=True, and bootstrap calls without a seed
+    (which should draw afresh every time), bypass the cache. Results come back
+    as from MarketCompetitionMetrics, lazy regression summaries included: the
+    cache stores each period's summary builder with that period's rows only.
+    Every call returns copies, so changing a result does not alter the cache.
+
+    Parameters:
+        max_entries (int): number of per-period results kept in memory
+        directory (str): optional directory for the on-disk tier
+        max_bytes (int): size limit of the on-disk tier
+    """
+
+    def __init__(self, max_entries=4096, directory=None, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.directory = os.path.expanduser(directory) if directory else None
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._disk = None  # {key: file size} in LRU order, read from the directory on first use
+        self._disk_bytes = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def hhi(self, *args, **kwargs):
+        """Cached MarketCompetitionMetrics.hhi."""
+        return self._call("hhi", args, kwargs)
+
+    def lerner(self, *args, **kwargs):
+        """Cached MarketCompetitionMetrics.lerner."""
+        return self._call("lerner", args, kwargs)
+
+    def panzar_rosse(self, *args, **kwargs):
+        """Cached MarketCompetitionMetrics.panzar_rosse."""
+        return self._call("panzar_rosse", args, kwargs)
+
+    def boone(self, *args, **kwargs):
+        """Cached MarketCompetitionMetrics.boone."""
+        return self._call("boone", args, kwargs)
+
+    def clear(self):
+        """Empty both tiers."""
+        self._memory.clear()
+        for path in self._disk_files():
+            os.remove(path)
+        self._disk = OrderedDict() if self.directory else None
+        self._disk_bytes = 0
+
+    # -- lookup ---------------------------------------------------------
+
+    def _call(self, name, args, kwargs):
+        method = getattr(MarketCompetitionMetrics, name)
+        bound = inspect.signature(method).bind(*args, **kwargs)
+        bound.apply_defaults()
+        call = bound.arguments
+        period_col = call.get("period_col")
+        if call.get("plot") or call.get("stacked") or (call.get("bootstrap") and call.get("seed") is None):
+            return method(*args, **kwargs)
+
+        columns = [col for arg in _COLUMN_ARGS[name] for col in _as_list(call[arg])]
+        columns += _as_list(period_col)
+        # Parquet / Arrow sources are read (pruned and filtered) once, up front.
+        data = call["data"] = read_columns(call["data"], columns, call.get("filters"))
+        call["filters"] = None
+        signature = repr((name, sorted((k, repr(v)) for k, v in call.items() if k not in _IGNORED_ARGS)))
+
+        keys, codes = group_codes(data, period_col if period_col else None)
+        if not len(keys):  # no rows with a valid period: nothing to cache
+            return method(**call)
+        fingerprints = self._fingerprints(data[list(dict.fromkeys(columns))], codes, len(keys))
+        entry_keys = [
+            hashlib.sha256(f"{signature}|{label!r}|{fp}".encode()).hexdigest()
+            for label, fp in zip(keys, fingerprints)
+        ]
+
+        values = [self._get(key) for key in entry_keys]
+        missing = [g for g, value in enumerate(values) if value is _MISSING]
+        self.hits += len(values) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            subset = data if len(missing) == len(keys) else data[np.isin(codes, missing)]
+            fresh = self._split(method(**dict(call, data=subset)), period_col, len(missing))
+            for g, value in zip(missing, fresh):
+                values[g] = value
+                self._put(entry_keys[g], value)
+        self._evict_disk()
+
+        return self._assemble(values, set(missing), period_col)
+
+    @staticmethod
+    def _fingerprints(frame, codes, n_groups):
+        """
+        One content hash per group of rows (independent of row order).
+
+        Row hashes are combined by two sums: of the hashes themselves and of
+        a non-linear remix of each one, so the second is not a multiple of
+        the first.
+        """
+        row_hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        order, bounds = group_slices(codes, n_groups)
+        counts = np.diff(bounds)
+        if not counts.any():
+            return ["0"] * n_groups
+        hashes = row_hashes[order[bounds[0]:bounds[-1]]]
+        starts = bounds[:-1] - bounds[0]
+        with np.errstate(over="ignore"):
+            sums = np.add.reduceat(hashes, starts)
+            mixed = np.add.reduceat(_splitmix64(hashes), starts)
+        return [f"{c}:{a:016x}:{b:016x}" for c, a, b in zip(counts, sums, mixed)]
+
+    @staticmethod
+    def _split(result, period_col, n_groups):
+        """Per-group pieces of a method result, in group order."""
+        if not period_col:
+            return [result]
+        if isinstance(result, pd.DataFrame):
+            return [result.iloc[[g]] for g in range(n_groups)]
+        return [{period: value} for period, value in result.items()]
+
+    @staticmethod
+    def _assemble(values, fresh, period_col):
+        """
+        Join the per-group pieces.
+
+        Pieces read from the cache are copied so callers cannot alter cached
+        entries; pieces in ``fresh`` were just computed and are returned as is,
+        lazy summaries included.
+        """
+        pieces = [value if g in fresh else copy.deepcopy(value) for g, value in enumerate(values)]
+        if not period_col:
+            return pieces[0]
+        if isinstance(pieces[0], pd.DataFrame):
+            return pd.concat(pieces)
+        return {period: value for piece in pieces for period, value in piece.items()}
+
+    # -- tiers ----------------------------------------------------------
+
+    def _get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.directory:
+            path = os.path.join(self.directory, key + ".pkl")
+            try:
+                with open(path, "rb") as fh:
+                    value = pickle.load(fh)
+                    size = os.fstat(fh.fileno()).st_size
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return _MISSING
+            os.utime(path)  # mark as recently used for later processes
+            self._track_disk(key, size)
+            self._remember(key, value)
+            return value
+        return _MISSING
+
+    def _put(self, key, value):
+        # Deep copies keep pending summaries but only their own group's rows.
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+        if self.directory:
+            path = os.path.join(self.directory, key + ".pkl")
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._track_disk(key, os.path.getsize(path))
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_files(self):
+        if not self.directory:
+            return []
+        return [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".pkl")]
+
+    def _disk_index(self):
+        if self._disk is None:
+            files = sorted((os.stat(path).st_mtime, path) for path in self._disk_files())
+            self._disk = OrderedDict()
+            for _, path in files:
+                self._disk[os.path.basename(path)[:-len(".pkl")]] = os.path.getsize(path)
+            self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _track_disk(self, key, size):
+        index = self._disk_index()
+        self._disk_bytes += size - index.pop(key, 0)
+        index[key] = size
+
+    def _evict_disk(self):
+        if not self.directory:
+            return
+        index = self._disk_index()
+        while index and self._disk_bytes > self.max_bytes:
+            key, size = index.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, key + ".pkl"))
+            except FileNotFoundError:  # already evicted by another process
+                pass
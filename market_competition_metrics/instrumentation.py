@@ -0,0 +1,209 @@
+# ==============================================================
+# instrumentation.py
+# Pluggable timing hooks for the hot paths of the package.
+#
+# Code paths are wrapped in `stage(name)` blocks (grouping, log
+# transforms, regression solves, SVD solves of degenerate groups,
+# summaries, plotting) and every public MarketCompetitionMetrics
+# method is a top-level stage. With no hook registered, `stage()` returns a
+# shared no-op object, so disabled instrumentation costs one global
+# lookup per block.
+# ==============================================================
+
+import contextvars
+import functools
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+_HOOKS = []
+_STACK = contextvars.ContextVar("market_competition_metrics_stage_stack", default=())
+
+
+class _NullStage:
+    """Stage used while no hook is registered: does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **info):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "info", "allocations", "_start", "_mem_start", "_child_peak", "_token")
+
+    def __init__(self, name, info):
+        self.name = name
+        self.info = info
+        self.allocations = tracemalloc.is_tracing()
+        self._child_peak = 0
+
+    def set(self, **info):
+        """Attach extra information (e.g. groups=...) to the stage."""
+        self.info.update(info)
+
+    def __enter__(self):
+        stack = _STACK.get()
+        if self.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+            tracemalloc.reset_peak()
+            self._mem_start = current
+        self._token = _STACK.set(stack + (self,))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        stack = _STACK.get()
+        _STACK.reset(self._token)
+        event = {
+            "path": "/".join(s.name for s in stack),
+            "stage": self.name,
+            "depth": len(stack) - 1,
+            "seconds": seconds,
+        }
+        event.update(self.info)
+        if self.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._child_peak)
+            event["alloc_bytes"] = current - self._mem_start
+            event["peak_bytes"] = peak - self._mem_start
+            if len(stack) > 1:
+                stack[-2]._child_peak = max(stack[-2]._child_peak, peak)
+            tracemalloc.reset_peak()
+        for hook in list(_HOOKS):
+            hook(event)
+        return False
+
+
+def stage(name, **info):
+    """
+    Context manager timing one stage of a computation.
+
+    Keyword arguments (rows=..., groups=...) are reported with the stage; more
+    can be attached inside the block with ``st.set(...)``.
+    """
+    if not _HOOKS:
+        return _NULL_STAGE
+    return _Stage(name, info)
+
+
+def instrumented(func):
+    """Decorator making a public method a top-level stage (rows=len(data))."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _HOOKS:
+            return func(*args, **kwargs)
+        data = args[0] if args else kwargs.get("data", kwargs.get("source"))
+        info = {"rows": len(data)} if hasattr(data, "__len__") and not isinstance(data, str) else {}
+        with _Stage(name, info):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def add_hook(callback):
+    """Register ``callback(event)``, called with a dict for every finished stage."""
+    _HOOKS.append(callback)
+    return callback
+
+
+def remove_hook(callback):
+    """Unregister a callback added with add_hook."""
+    _HOOKS.remove(callback)
+
+
+class Collector:
+    """
+    Built-in hook recording every stage of the calls made inside a ``with`` block.
+
+    Example:
+        with Collector(allocations=True) as prof:
+            MarketCompetitionMetrics.boone(df, ...)
+        prof.summary()
+        prof.to_json("profile.json")
+        prof.to_collapsed("profile.folded")   # flamegraph.pl / speedscope input
+
+    Parameters:
+        allocations (bool): also record allocated and peak bytes per stage
+            (uses tracemalloc, which slows NumPy-heavy code noticeably)
+    """
+
+    def __init__(self, allocations=False):
+        self.allocations = allocations
+        self.events = []
+        self._started_tracing = False
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def __enter__(self):
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc):
+        remove_hook(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def summary(self):
+        """pd.DataFrame with calls, total seconds, rows and groups per stage path."""
+        frame = pd.DataFrame(self.events)
+        if frame.empty:
+            return frame
+        aggregations = {"calls": ("seconds", "size"), "seconds": ("seconds", "sum")}
+        for col, how in [("rows", "sum"), ("groups", "sum"), ("alloc_bytes", "sum"), ("peak_bytes", "max")]:
+            if col in frame:
+                aggregations[col] = (col, how)
+        return frame.groupby("path", sort=False).agg(**aggregations).sort_values("seconds", ascending=False)
+
+    def to_json(self, path=None):
+        """Events as a JSON string, also written to ``path`` if given."""
+        text = json.dumps(self.events, indent=2, default=float)
+        if path:
+            with open(path, "w") as fh:
+                fh.write(text)
+        return text
+
+    def to_collapsed(self, path=None):
+        """
+        Flame-graph "collapsed stack" lines (``a;b;c microseconds``) of self time,
+        also written to ``path`` if given.
+        """
+        totals, children = {}, {}
+        for event in self.events:
+            path_key = event["path"]
+            totals[path_key] = totals.get(path_key, 0.0) + event["seconds"]
+            parent = path_key.rpartition("/")[0]
+            if parent:
+                children[parent] = children.get(parent, 0.0) + event["seconds"]
+        lines = [
+            f"{key.replace('/', ';')} {max(int(round((total - children.get(key, 0.0)) * 1e6)), 0)}"
+            for key, total in totals.items()
+        ]
+        text = "\n".join(lines) + ("\n" if lines else "")
+        if path:
+            with open(path, "w") as fh:
+                fh.write(text)
+        return text
@@ -18,10 +18,257 @@
 # Date: 2025
 # ==============================================================
 
+from functools import partial
+
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
-import statsmodels.api as sm
+
+from ._arrow import columnar
+from ._bootstrap import bootstrap_ols, bootstrap_sums, label_ids, new_seed, percentile_interval
+from ._merger import screen_pairs
+from ._ols import (
+    RegressionResult, float_dtype, group_codes, group_result, grouped_ols, log_column, log_design, rolling_ols,
+    summary_builders,
+)
+from ._panel import within_ols
+from ._parallel import map_groups
+from ._plotting import plot_contributions, plot_series
+from ._streaming import DEFAULT_CHUNKSIZE, stream_period_sums
+from .instrumentation import instrumented, stage
+
+
+def _wants_frame(period_col, as_frame):
+    """By default a list of grouping keys returns a DataFrame and a single period column a dict."""
+    return isinstance(period_col, (list, tuple)) if as_frame is None else as_frame
+
+
+def _frame_or_dict(frame, column, period_col, as_frame):
+    """Return the per-group frame, or the historical {period: value} dict view of one of its columns."""
+    return frame if _wants_frame(period_col, as_frame) else frame[column].to_dict()
+
+
+def _group_sum(values, codes, n_groups):
+    """Per-group sum of a row-level term, skipping NaN terms as the pandas sum did."""
+    keep = (codes >= 0) & ~np.isnan(values)
+    return np.bincount(codes[keep], weights=values[keep], minlength=n_groups)
+
+
+def _regression_frame(keys, fit, name, coef_cols):
+    """Columnar per-group output of a grouped_ols fit."""
+    frame = pd.DataFrame({name: fit["params"][:, 1:].sum(axis=1)}, index=keys)
+    for j, col in enumerate(coef_cols):
+        frame[col] = fit["params"][:, j + 1]
+    if fit["bse"] is not None:
+        for j, col in enumerate(["const"] + list(coef_cols)):
+            frame[f"{col}_se"] = fit["bse"][:, j]
+    frame["nobs"] = fit["nobs"]
+    for col in ("df_resid", "rank", "cond", "degenerate"):
+        if col in fit:
+            frame[col] = fit[col]
+    return frame
+
+
+def _bootstrap(func, arrays, keys, codes, replicates, seed, n_jobs=None, executor=None):
+    """
+    Bootstrap replicates of every group (bootstrap_sums or bootstrap_ols), optionally in parallel.
+
+    Draws are keyed by the group labels, so a period gets the same interval
+    whichever other periods are in ``data``.
+    """
+    with stage("bootstrap", replicates=replicates):
+        return map_groups(
+            partial(func, replicates=replicates, seed=new_seed(seed)),
+            list(arrays) + [label_ids(keys, codes)], codes, len(keys), n_jobs, executor
+        )
+
+
+def _with_ci(frame, column, replicates, ci, period_col):
+    """Insert percentile bounds of (n_groups, replicates) estimates right after ``column``."""
+    low, high = percentile_interval(replicates, ci)
+    at = frame.columns.get_loc(column) + 1
+    frame.insert(at, f"{column}_ci_low", low)
+    frame.insert(at + 1, f"{column}_ci_high", high)
+    return frame if period_col else frame.reset_index(drop=True)
+
+
+def _squared(data, col):
+    """A column squared in one buffer (no copy of the column is kept)."""
+    values = data[col].to_numpy(dtype=float, copy=True)
+    return np.square(values, out=values)
+
+
+# Rows per block when row-level terms are summed block by block.
+_BLOCK_ROWS = 1 << 16
+
+
+def _map_blocks(func, arrays, codes, n_groups):
+    """
+    Sum ``func(*blocks, block_codes, n_groups)`` over blocks of rows.
+
+    Used by the HHI and Lerner sums: ``arrays`` are views of the value
+    columns, so only block-sized temporaries are ever allocated.
+    """
+    out = np.zeros(n_groups)
+    for start in range(0, len(codes), _BLOCK_ROWS):
+        rows = slice(start, start + _BLOCK_ROWS)
+        out += func(*(values[rows] for values in arrays), codes[rows], n_groups)
+    return out
+
+
+def _sum_squares(share, codes, n_groups):
+    """Per-group sum of squared shares (HHI)."""
+    return _group_sum(np.square(share, dtype=float), codes, n_groups)
+
+
+CONCENTRATION_MEASURES = ("CR4", "CR8", "HHI", "equivalent", "entropy", "theil", "gini")
+
+
+def _measure_name(measure):
+    """Canonical spelling of a concentration measure ("cr4" -> "CR4", "Gini" -> "gini")."""
+    name = str(measure).strip()
+    upper = name.upper()
+    if upper.startswith("CR") and upper[2:].isdigit() and int(upper[2:]) > 0:
+        return f"CR{int(upper[2:])}"
+    if upper == "HHI":
+        return upper
+    if name.lower() in CONCENTRATION_MEASURES:
+        return name.lower()
+    raise ValueError(f"unknown concentration measure: {measure!r}")
+
+
+def _concentration(shares, codes, n_groups, measures):
+    """
+    Concentration measures per group from one sort of the shares.
+
+    Shares are ranked in decreasing order within each group once; every
+    measure is then a bincount over (rank, share) terms. Missing (NaN) shares
+    are skipped, as in hhi(). Measure names are case-insensitive and the
+    columns use their canonical spelling (see _measure_name).
+    """
+    measures = [_measure_name(measure) for measure in measures]
+    keep = (codes >= 0) & ~np.isnan(shares)
+    s, g = shares[keep], codes[keep]
+    order = np.lexsort((-s, g))
+    s, g = s[order], g[order]
+    n = np.bincount(g, minlength=n_groups)
+    rank = np.arange(len(s)) - (np.cumsum(n) - n)[g]  # 0 for the largest share
+    total = np.bincount(g, weights=s, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = s / total[g]
+        plogp = np.where(p > 0, p * np.log(p), 0.0)
+
+    out = {}
+    for measure in measures:
+        if measure.startswith("CR"):
+            k = int(measure[2:])
+            out[measure] = np.bincount(g, weights=np.where(rank < k, s, 0.0), minlength=n_groups)
+        elif measure == "HHI":
+            out[measure] = np.bincount(g, weights=s * s, minlength=n_groups)
+        elif measure == "equivalent":
+            with np.errstate(divide="ignore"):
+                out[measure] = 1.0 / np.bincount(g, weights=p * p, minlength=n_groups)
+        elif measure in ("entropy", "theil"):
+            entropy = -np.bincount(g, weights=plogp, minlength=n_groups)
+            with np.errstate(divide="ignore"):
+                out[measure] = entropy if measure == "entropy" else np.log(n) - entropy
+        elif measure == "gini":
+            # G = 2 * sum(i * p_(i)) / n - (n + 1) / n, with p in increasing order (i = 1..n)
+            ascending = (n[g] - rank).astype(float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[measure] = (2 * np.bincount(g, weights=ascending * p, minlength=n_groups) - n - 1) / n
+    return out
+
+
+def _lerner_arrays(data, price_col, cost_col, share_col):
+    """Share, price and marginal cost columns as float arrays (views of float64 columns, no copy)."""
+    return [data[col].to_numpy(dtype=float) for col in (share_col, price_col, cost_col)]
+
+
+def _lerner_contribution(data, price_col, cost_col, share_col):
+    """Vectorized s_i * (P_i - MC_i) / P_i for every row."""
+    share, price, cost = _lerner_arrays(data, price_col, cost_col, share_col)
+    return share * (price - cost) / price
+
+
+def _lerner_block(share, price, cost, codes, n_groups):
+    """Per-group sum of s_i * L_i over one block of rows, skipping NaN terms as the pandas sum did."""
+    # One temporary, updated in place: (P - MC) / P * s
+    contribution = np.subtract(price, cost, dtype=float)
+    contribution /= price
+    contribution *= share
+    return _group_sum(contribution, codes, n_groups)
+
+
+def _market_lerner(share, price, cost, codes, n_groups):
+    """Per-group market Lerner index, summed over blocks of rows so no full-length temporary is built."""
+    return _map_blocks(_lerner_block, [share, price, cost], codes, n_groups)
+
+
+def _contribution_matrix(data, firm_col, contribution, periods, codes):
+    """Sum contributions into a firm x period matrix in one bincount pass."""
+    keep = (codes >= 0) & ~np.isnan(contribution)
+    firm_codes, firms = pd.factorize(data[firm_col], sort=True)
+    keep &= firm_codes >= 0
+    flat = firm_codes[keep] * len(periods) + codes[keep]
+    values = np.bincount(flat, weights=contribution[keep], minlength=len(firms) * len(periods))
+    return pd.DataFrame(
+        values.reshape(len(firms), len(periods)),
+        index=pd.Index(firms, name=firm_col),
+        columns=periods,
+    )
+
+
+def _panel_fit(data, x_cols, y_col, firm_col, period_col, time_effects, cluster, inference):
+    """Within (fixed-effects) fit of log(y_col) on log(x_cols); rows with a missing key or non-finite log are dropped."""
+    if time_effects and period_col is None:
+        raise ValueError("period_col is required with time_effects=True")
+    X = log_design(data, x_cols)
+    y = log_column(data, y_col)
+    effect_cols = [firm_col] + ([period_col] if time_effects else [])
+    factors = [pd.factorize(data[col])[0] for col in effect_cols]
+    cluster_codes = pd.factorize(data[cluster])[0] if cluster else None
+
+    keep = np.isfinite(X).all(axis=1) & np.isfinite(y)
+    for codes in factors + ([cluster_codes] if cluster else []):
+        keep &= codes >= 0
+    effects = [pd.factorize(codes[keep])[0] for codes in factors]
+    if cluster:
+        cluster_codes = pd.factorize(cluster_codes[keep])[0]
+    # One dummy per firm, plus one per period but the first with time effects.
+    absorbed = sum(codes.max(initial=-1) + 1 for codes in effects) - (len(effects) - 1)
+    return within_ols(X[keep], y[keep], effects, absorbed, cluster_codes, inference)
+
+
+def _panel_result(fit, name, coef_cols):
+    slopes = fit["params"][1:]
+    return RegressionResult(
+        {name: np.sum(slopes), "coefficients": dict(zip(coef_cols, slopes))},
+        fit["params"], fit["bse"], fit["nobs"], df_resid=fit["df_resid"],
+    )
+
+
+def _series_breaks(keys):
+    """With several grouping keys, True where a group starts a new series of the leading key(s)."""
+    if not isinstance(keys, pd.MultiIndex) or not len(keys):
+        return None
+    breaks = np.zeros(len(keys), dtype=bool)
+    breaks[0] = True
+    for level_codes in keys.codes[:-1]:
+        breaks[1:] |= level_codes[1:] != level_codes[:-1]
+    return breaks
+
+
+def _rolling_frame(keys, fit, name, coef_cols=None):
+    """Tidy DataFrame of a rolling_ols fit: one row per window."""
+    frame = pd.DataFrame({
+        "window_start": [keys[i] for i in fit["start"]],
+        "window_end": [keys[i] for i in fit["end"]],
+        name: fit["params"][:, 1:].sum(axis=1),
+    })
+    for j, col in enumerate(coef_cols or []):
+        frame[col] = fit["params"][:, j + 1]
+    frame["nobs"] = fit["nobs"]
+    return frame
 
 
 class MarketCompetitionMetrics:
@@ -31,233 +278,586 @@ class MarketCompetitionMetrics:
     """
     
     @staticmethod 
-    def hhi(data, share_col, period_col=None, plot=False):
+    @instrumented
+    @columnar
+    def hhi(data, share_col, period_col=None, plot=False, as_frame=None,
+            plot_dir=None, plot_format="png", bootstrap=None, ci=0.95, seed=None, n_jobs=None, executor=None,
+            filters=None):
         """
         Compute Herfindahl-Hirschman Index (HHI).
         
         Parameters:
-            data (pd.DataFrame): dataset
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
             share_col (str): column with market shares
-            period_col (str): optional column name for period (day, month, year)
+            period_col (str or list): optional column name for period (day, month, year),
+                or a list of grouping columns such as ["Market", "Period"]
             plot (bool): whether to plot HHI over time if period_col is provided
+            as_frame (bool): return a DataFrame indexed by the grouping keys instead
+                of a dict (default: True when period_col is a list)
+            plot_dir (str): write plots to this directory instead of showing them
+                (one file per market when period_col lists several columns)
+            plot_format (str): file format for plot_dir, e.g. "png" or "svg"
+            bootstrap (int): number of bootstrap resamples (rows drawn with replacement
+                within each period); a DataFrame is then returned with
+                "<name>_ci_low" and "<name>_ci_high" percentile bounds
+            ci (float): confidence level of the bootstrap interval
+            seed (int): seed making the bootstrap reproducible, whatever n_jobs
+            n_jobs (int): worker processes for the bootstrap (-1 for all cores)
+            executor (concurrent.futures.Executor): process pool to reuse across calls
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
             
         Returns:
-            float or dict: HHI for all firms (if no period) or per period
+            float, dict or pd.DataFrame: HHI for all firms (if no period), per period,
+                or a DataFrame with an "HHI" column
         """
-        if period_col:
-            hhi_values = data.groupby(period_col)[share_col].apply(lambda x: np.sum(x**2)).to_dict()
+        if period_col or bootstrap:
+            keys, codes = group_codes(data, period_col or None)
+            values = _map_blocks(_sum_squares, [data[share_col].to_numpy(dtype=float)], codes, len(keys))
+            frame = pd.DataFrame({"HHI": values}, index=keys)
             
             # Visualization 
-            if plot:
-                plt.figure(figsize=(8,5))
-                plt.plot(list(hhi_values.keys()), list(hhi_values.values()), marker="o", color="blue")
-                plt.title("Evolution of the HHI Index over Time")
-                plt.xlabel("Period")
-                plt.ylabel("HHI")
-                plt.grid(True, linestyle="--", alpha=0.6)
-                plt.show()
+            if plot and period_col:
+                with stage("plot"):
+                    plot_series(keys, values, "hhi", "Evolution of the HHI Index over Time", "HHI", "blue",
+                                plot_dir, plot_format)
+
+            if bootstrap:
+                squares = _squared(data, share_col)
+                replicates = _bootstrap(bootstrap_sums, [squares], keys, codes, bootstrap, seed, n_jobs, executor)
+                return _with_ci(frame, "HHI", replicates, ci, period_col)
             
-            return hhi_values
+            return _frame_or_dict(frame, "HHI", period_col, as_frame)
         else:
             return np.sum(data[share_col] ** 2)
         
         
     @staticmethod
-    def lerner(data, firm_col, price_col, cost_col, share_col, period_col=None, plot=False, stacked=False):
+    @instrumented
+    @columnar
+    def concentration(data, share_col, period_col=None, measures=None, filters=None):
+        """
+        Compute several concentration measures from a single sort of the shares.
+
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            share_col (str): column with market shares
+            period_col (str or list): optional column name for period (day, month, year),
+                or a list of grouping columns such as ["Market", "Period"]
+            measures (list): measures to compute (default: all of CONCENTRATION_MEASURES);
+                names are case-insensitive and columns use the spellings below
+                - "CR4", "CR8" or any "CR<k>": sum of the k largest shares
+                - "HHI": sum of squared shares, as hhi()
+                - "equivalent": number-equivalent of firms, 1 / sum of squared
+                  normalized shares (10000 / HHI for shares in percent)
+                - "entropy": -sum(p_i * ln p_i) of the normalized shares p_i
+                - "theil": Theil index, ln(n) - entropy
+                - "gini": Gini coefficient of the shares
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            pd.DataFrame: one column per measure, indexed by the grouping keys
+                (a single row if no period_col)
+        """
+        keys, codes = group_codes(data, period_col or None)
+        shares = data[share_col].to_numpy(dtype=float)
+        values = _concentration(shares, codes, len(keys), list(measures or CONCENTRATION_MEASURES))
+        frame = pd.DataFrame(values, index=keys)
+        return frame if period_col else frame.reset_index(drop=True)
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def lerner(data, firm_col, price_col, cost_col, share_col, period_col=None, plot=False, stacked=False,
+               n_jobs=None, executor=None, as_frame=None, plot_dir=None, plot_format="png",
+               bootstrap=None, ci=0.95, seed=None, filters=None):
         """
         Compute Lerner Index (market + firm contributions) per period.
 
         Parameters:
-            data (pd.DataFrame): dataset
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
             firm_col (str): column with firm names
             price_col (str): column with prices
             cost_col (str): column with marginal costs
             share_col (str): column with market shares
-            period_col (str): optional column for periods (month, year...)
+            period_col (str or list): optional column for periods (month, year...),
+                or a list of grouping columns such as ["Market", "Period"]
             plot (bool): if True, plot market Lerner index over time
             stacked (bool): if True, plot stacked bar chart of firm contributions
+            n_jobs (int): worker processes for the per-period sums (-1 for all cores)
+            executor (concurrent.futures.Executor): process pool to reuse across calls
+            as_frame (bool): return a DataFrame indexed by the grouping keys instead
+                of a dict (default: True when period_col is a list)
+            plot_dir (str): write plots to this directory instead of showing them
+                (one file per market when period_col lists several columns)
+            plot_format (str): file format for plot_dir, e.g. "png" or "svg"
+            bootstrap (int): number of bootstrap resamples (rows drawn with replacement
+                within each period); a DataFrame is then returned with
+                "<name>_ci_low" and "<name>_ci_high" percentile bounds
+            ci (float): confidence level of the bootstrap interval
+            seed (int): seed making the bootstrap reproducible, whatever n_jobs
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
 
         Returns:
-            dict: {period: market Lerner index}
+            dict or pd.DataFrame: {period: market Lerner index}, or a DataFrame
+                with a "Lerner" column
         """
-        def _compute_lerner(df):
-            df = df.copy()
-            df["Lerner_i"] = (df[price_col] - df[cost_col]) / df[price_col]
-            L_market = np.sum(df[share_col] * df["Lerner_i"])
-            df["contribution"] = df[share_col] * df["Lerner_i"]
-            return {"market": L_market, "contributions": df[[firm_col, "contribution"]]}
-
-        if period_col:
-            results = {period: _compute_lerner(df) for period, df in data.groupby(period_col)}
+        if period_col or bootstrap:
+            periods, codes = group_codes(data, period_col or None)
+            market = map_groups(
+                _market_lerner, _lerner_arrays(data, price_col, cost_col, share_col), codes, len(periods),
+                n_jobs, executor
+            )
 
-            # Extract market Lerner values for dictionary output
-            market_dict = {period: res["market"] for period, res in results.items()}
+            frame = pd.DataFrame({"Lerner": market}, index=periods)
 
             # Line plot of LM over time
-            if plot:
-                periods = list(market_dict.keys())
-                market_values = list(market_dict.values())
-
-                plt.figure(figsize=(8, 5))
-                plt.plot(periods, market_values, marker="o", color="green")
-                plt.title("Market Lerner Index Over Time")
-                plt.xlabel("Period")
-                plt.ylabel("Lerner Index (LM)")
-                plt.grid(True, linestyle="--", alpha=0.6)
-                plt.show()
+            if plot and period_col:
+                with stage("plot"):
+                    plot_series(periods, market, "lerner", "Market Lerner Index Over Time", "Lerner Index (LM)",
+                                "green", plot_dir, plot_format)
 
             # Stacked contributions
-            if stacked:
-                firms = sorted(data[firm_col].unique())
-                contributions = {firm: [] for firm in firms}
-                periods = list(results.keys())
-
-                for period, res in results.items():
-                    df_contrib = res["contributions"].set_index(firm_col)
-                    for firm in firms:
-                        contributions[firm].append(df_contrib.loc[firm, "contribution"] if firm in df_contrib.index else 0)
-
-                plt.figure(figsize=(12, 6))
-                bottom = np.zeros(len(periods))
-                for firm in firms:
-                    plt.bar(periods, contributions[firm], bottom=bottom, label=firm)
-                    bottom += contributions[firm]
-                plt.title("Firm Contributions to Market Lerner Index")
-                plt.xlabel("Period")
-                plt.ylabel("Contribution to LM")
-                plt.legend(title="Firms", bbox_to_anchor=(0.5, -0.15), loc="upper center", ncol=5)  # move legend below
-                plt.tight_layout()
-                plt.show()
-
-            return market_dict
+            if stacked and period_col:
+                with stage("plot"):
+                    contribution = _lerner_contribution(data, price_col, cost_col, share_col)
+                    matrix = _contribution_matrix(data, firm_col, contribution, periods, codes)
+                    plot_contributions(periods, matrix, "lerner_contributions", plot_dir, plot_format)
+
+            if bootstrap:
+                contribution = _lerner_contribution(data, price_col, cost_col, share_col)
+                replicates = _bootstrap(
+                    bootstrap_sums, [contribution], periods, codes, bootstrap, seed, n_jobs, executor
+                )
+                return _with_ci(frame, "Lerner", replicates, ci, period_col)
+
+            return _frame_or_dict(frame, "Lerner", period_col, as_frame)
 
         else:
-            res = _compute_lerner(data)
-            return {"overall_market": res["market"]}
+            return {"overall_market": np.nansum(_lerner_contribution(data, price_col, cost_col, share_col))}
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def lerner_contributions(data, firm_col, price_col, cost_col, share_col, period_col=None, filters=None):
+        """
+        Firm contributions (s_i * L_i) to the market Lerner index.
+
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            firm_col (str): column with firm names
+            price_col (str): column with prices
+            cost_col (str): column with marginal costs
+            share_col (str): column with market shares
+            period_col (str or list): optional column(s) for periods (month, year...)
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            pd.DataFrame: firms (sorted) x periods matrix of contributions, 0 where a
+                firm is absent from a period; a single "overall_market" column if no
+                period_col. Column sums equal the values returned by lerner().
+        """
+        contribution = _lerner_contribution(data, price_col, cost_col, share_col)
+        periods, codes = group_codes(data, period_col)
+        matrix = _contribution_matrix(data, firm_col, contribution, periods, codes)
+        if not period_col:
+            matrix.columns = ["overall_market"]
+        return matrix
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def merger_screen(data, firm_col, share_col, period_col=None, delta_threshold=200, hhi_threshold=2500,
+                      top_k=None, filters=None):
+        """
+        Screen every pair of firms for the HHI increase their merger would cause.
+
+        Merging firms i and j raises the HHI by ΔHHI = 2 * s_i * s_j. Only pairs
+        clearing both thresholds are built, never the full firm x firm matrix.
+
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            firm_col (str): column with firm names (rows of the same firm in a
+                period are summed)
+            share_col (str): column with market shares
+            period_col (str or list): optional column for periods, or a list of
+                grouping columns such as ["Market", "Period"]
+            delta_threshold (float): keep pairs with ΔHHI above this (None: no bound)
+            hhi_threshold (float): keep pairs with post-merger HHI above this (None: no bound)
+            top_k (int): keep only the k pairs with the largest ΔHHI per period
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            pd.DataFrame: one row per pair, indexed by the grouping keys, with
+                columns firm_a, firm_b (firm_a has the larger share), share_a,
+                share_b, delta_hhi, hhi and post_merger_hhi; sorted by period
+                then decreasing delta_hhi
+        """
+        keys, codes = group_codes(data, period_col)
+        firm_codes, firms = pd.factorize(data[firm_col], sort=True)
+        values = data[share_col].to_numpy(dtype=float)
+        valid = (codes >= 0) & (firm_codes >= 0) & ~np.isnan(values)
+        flat, position = np.unique(codes[valid] * len(firms) + firm_codes[valid], return_inverse=True)
+        shares = np.bincount(position, weights=values[valid], minlength=len(flat))
+        pair_groups, pair_firms = np.divmod(flat, len(firms))
+
+        pairs = screen_pairs(shares, pair_groups, len(keys), delta_threshold, hhi_threshold, top_k)
+        first, second, group = pairs["first"], pairs["second"], pairs["group"]
+        hhi = pairs["hhi"][group]
+        frame = pd.DataFrame({
+            "firm_a": firms.take(pair_firms[first]),
+            "firm_b": firms.take(pair_firms[second]),
+            "share_a": shares[first],
+            "share_b": shares[second],
+            "delta_hhi": pairs["delta"],
+            "hhi": hhi,
+            "post_merger_hhi": hhi + pairs["delta"],
+        }, index=keys.take(group) if period_col else None)
+        return frame
 
 
     @staticmethod
-    def panzar_rosse(data, revenue_col, input_cols, period_col=None, plot=False):
+    @instrumented
+    def hhi_stream(source, share_col, period_col=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Compute HHI from data that does not fit in memory.
+
+        Parameters:
+            source: CSV or Parquet path, or an iterable of pd.DataFrame chunks
+            share_col (str): column with market shares
+            period_col (str): optional column name for period (day, month, year)
+            chunksize (int): rows read per chunk from a file
+
+        Returns:
+            float or dict: same as hhi(), memory bounded by the number of periods
+        """
+        return stream_period_sums(
+            source, [share_col], period_col,
+            lambda chunk: chunk[share_col].to_numpy(dtype=float) ** 2,
+            chunksize
+        )
+
+
+    @staticmethod
+    @instrumented
+    def lerner_stream(source, price_col, cost_col, share_col, period_col=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Compute the market Lerner index from data that does not fit in memory.
+
+        Parameters:
+            source: CSV or Parquet path, or an iterable of pd.DataFrame chunks
+            price_col (str): column with prices
+            cost_col (str): column with marginal costs
+            share_col (str): column with market shares
+            period_col (str): optional column for periods (month, year...)
+            chunksize (int): rows read per chunk from a file
+
+        Returns:
+            dict: same as lerner(), memory bounded by the number of periods
+        """
+        result = stream_period_sums(
+            source, [price_col, cost_col, share_col], period_col,
+            lambda chunk: _lerner_contribution(chunk, price_col, cost_col, share_col),
+            chunksize
+        )
+        return result if period_col else {"overall_market": result}
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def panzar_rosse(data, revenue_col, input_cols, period_col=None, plot=False, inference=True,
+                     n_jobs=None, executor=None, as_frame=None, low_memory=False,
+                     plot_dir=None, plot_format="png", bootstrap=None, ci=0.95, seed=None, filters=None):
         """
         Estimate Panzar-Rosse H-statistic.
 
         Parameters:
-            data (pd.DataFrame): dataset
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
             revenue_col (str): column with revenues
             input_cols (list): list of column names for input prices
-            period_col (str): optional column for periods (month, year, etc.)
+            period_col (str or list): optional column for periods (month, year, etc.),
+                or a list of grouping columns such as ["Market", "Period"]
             plot (bool): if True, plot H-statistic over time
+            inference (bool): if False, skip standard errors and the regression summary
+            n_jobs (int): worker processes for the per-period regressions (-1 for all cores)
+            executor (concurrent.futures.Executor): process pool to reuse across calls
+            as_frame (bool): return a DataFrame indexed by the grouping keys instead
+                of a dict (default: True when period_col is a list)
+            low_memory (bool): log-transform and centre in float32 buffers; the
+                cross-products are still accumulated in float64
+            plot_dir (str): write plots to this directory instead of showing them
+                (one file per market when period_col lists several columns)
+            plot_format (str): file format for plot_dir, e.g. "png" or "svg"
+            bootstrap (int): number of bootstrap resamples (rows drawn with replacement
+                within each period); a DataFrame is then returned with
+                "<name>_ci_low" and "<name>_ci_high" percentile bounds
+            ci (float): confidence level of the bootstrap interval
+            seed (int): seed making the bootstrap reproducible, whatever n_jobs
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
 
         Returns:
-            dict:
-                - If no period_col: {"overall": H-statistic, "summary": model.summary()}
+            dict or pd.DataFrame:
+                - If no period_col: {"H": H-statistic, "summary": model.summary()}
                 - If period_col: {period: {"H": value, "summary": model.summary()}}
+
+            Each result is a RegressionResult: the summary is only built when
+            ``result["summary"]`` is read, and ``result.params``, ``result.bse``
+            and ``result.nobs`` hold the raw estimates.
+
+            The DataFrame output has columns H, one coefficient per input,
+            <name>_se standard errors (if inference) and nobs.
         """
 
-        def _compute_pr(df):
-            X = sm.add_constant(np.log(df[input_cols]))
-            y = np.log(df[revenue_col])
-            model = sm.OLS(y, X).fit()
-            H_stat = np.sum(model.params[1:])  # exclude constant
-            return {"H": H_stat, "summary": model.summary()}
+        keys, codes = group_codes(data, period_col)
+        dtype = float_dtype(low_memory)
+        X = log_design(data, input_cols, dtype)
+        y = log_column(data, revenue_col, dtype)
+        fit = map_groups(partial(grouped_ols, inference=inference), [X, y], codes, len(keys), n_jobs, executor)
+        def _compute_pr(g, summary):
+            H_stat = np.sum(fit["params"][g, 1:])  # exclude constant
+            return group_result(fit, g, {"H": H_stat}, summary(g) if summary else None)
 
         # Case: compute per period
-        if period_col:
-            results = {}
-            H_values = []
-
-            for period, df in data.groupby(period_col):
-                res = _compute_pr(df)
-                results[period] = res
-                H_values.append((period, res["H"]))
+        if period_col or bootstrap:
+            frame = _regression_frame(keys, fit, "H", input_cols)
 
             # Plot if requested
-            if plot:
-                plt.figure(figsize=(8, 5))
-                plt.plot(
-                    [p for p, _ in H_values],
-                    [h for _, h in H_values],
-                    marker="o",
-                    linestyle="-",
-                    color="blue"
-                )
-                plt.title("Evolution of Panzar-Rosse H-statistic Over Time")
-                plt.xlabel("Period")
-                plt.ylabel("H-statistic")
-                plt.grid(True, linestyle="--", alpha=0.6)
-                plt.show()
+            if plot and period_col:
+                with stage("plot"):
+                    plot_series(keys, frame["H"].to_numpy(), "panzar_rosse",
+                                "Evolution of Panzar-Rosse H-statistic Over Time", "H-statistic", "blue",
+                                plot_dir, plot_format)
+
+            if bootstrap:
+                slopes = _bootstrap(bootstrap_ols, [X, y], keys, codes, bootstrap, seed, n_jobs, executor)
+                return _with_ci(frame, "H", slopes.sum(axis=2), ci, period_col)
 
-            return results
+            if _wants_frame(period_col, as_frame):
+                return frame
+            summary = summary_builders(X, y, codes, len(keys), input_cols, revenue_col) if inference else None
+            return {period: _compute_pr(g, summary) for g, period in enumerate(keys)}
 
         # Case: overall dataset (no period)
         else:
-            return _compute_pr(data) 
+            summary = summary_builders(X, y, codes, len(keys), input_cols, revenue_col) if inference else None
+            return _compute_pr(0, summary)
      
     
     @staticmethod
-    def boone(data, cost_cols, profit_col, period_col=None, plot=False):
+    @instrumented
+    @columnar
+    def boone(data, cost_cols, profit_col, period_col=None, plot=False, inference=True,
+              n_jobs=None, executor=None, as_frame=None, low_memory=False, plot_dir=None, plot_format="png",
+              bootstrap=None, ci=0.95, seed=None, filters=None):
         """
         Estimate Boone indicator using log-log regression with one or multiple cost variables.
 
         Parameters:
-            data (pd.DataFrame): dataset
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
             cost_cols (list): list of columns with cost variables (labour, capital, borrowed funds, etc.)
             profit_col (str): column with profits
-            period_col (str): optional column for periods (month, year, etc.)
+            period_col (str or list): optional column for periods (month, year, etc.),
+                or a list of grouping columns such as ["Market", "Period"]
             plot (bool): if True, plot Boone coefficient over time
+            inference (bool): if False, skip standard errors and the regression summary
+            n_jobs (int): worker processes for the per-period regressions (-1 for all cores)
+            executor (concurrent.futures.Executor): process pool to reuse across calls
+            as_frame (bool): return a DataFrame indexed by the grouping keys instead
+                of a dict (default: True when period_col is a list)
+            low_memory (bool): log-transform and centre in float32 buffers; the
+                cross-products are still accumulated in float64
+            plot_dir (str): write plots to this directory instead of showing them
+                (one file per market when period_col lists several columns)
+            plot_format (str): file format for plot_dir, e.g. "png" or "svg"
+            bootstrap (int): number of bootstrap resamples (rows drawn with replacement
+                within each period); a DataFrame is then returned with
+                "<name>_ci_low" and "<name>_ci_high" percentile bounds
+            ci (float): confidence level of the bootstrap interval
+            seed (int): seed making the bootstrap reproducible, whatever n_jobs
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
 
         Returns:
-            dict:
+            dict or pd.DataFrame:
                 - If no period_col:
                     {"Boone": β_global, "coefficients": dict of β_i, "summary": model.summary()}
                 - If period_col:
                     {period: {"Boone": β_global, "coefficients": dict of β_i, "summary": model.summary()}}
-        """
 
-        def _compute_boone(df):
-            X = sm.add_constant(np.log(df[cost_cols]))
-            y = np.log(df[profit_col])
-            model = sm.OLS(y, X).fit()
+            Each result is a RegressionResult with a lazily built summary (see panzar_rosse).
+            The DataFrame output has columns Boone, one β_i per cost variable,
+            <name>_se standard errors (if inference) and nobs.
+        """
 
-            betas = model.params[1:]  # exclude constant
+        keys, codes = group_codes(data, period_col)
+        dtype = float_dtype(low_memory)
+        X = log_design(data, cost_cols, dtype)
+        y = log_column(data, profit_col, dtype)
+        fit = map_groups(partial(grouped_ols, inference=inference), [X, y], codes, len(keys), n_jobs, executor)
+        def _compute_boone(g, summary):
+            betas = fit["params"][g, 1:]  # exclude constant
             betas_dict = {col: betas[i] for i, col in enumerate(cost_cols)}  # label coefficients
             beta_global = np.sum(betas)  # Boone indicator = sum of betas
 
-            return {
-                "Boone": beta_global,
-                "coefficients": betas_dict,
-                "summary": model.summary()
-            }
+            return group_result(
+                fit, g,
+                {"Boone": beta_global, "coefficients": betas_dict},
+                summary(g) if summary else None
+            )
 
         # Case: per period
-        if period_col:
-            results = {}
-            boone_values = []
-
-            for period, df in data.groupby(period_col):
-                res = _compute_boone(df)
-                results[period] = res
-                boone_values.append((period, res["Boone"]))
+        if period_col or bootstrap:
+            frame = _regression_frame(keys, fit, "Boone", cost_cols)
 
             # Plot Boone evolution if requested
-            if plot:
-                plt.figure(figsize=(8, 5))
-                plt.plot(
-                    [p for p, _ in boone_values],
-                    [b for _, b in boone_values],
-                    marker="o",
-                    linestyle="-",
-                    color="green"
-                )
-                plt.title("Evolution of Boone Indicator (β) Over Time")
-                plt.xlabel("Period")
-                plt.ylabel("Boone Indicator (β)")
-                plt.grid(True, linestyle="--", alpha=0.6)
-                plt.show()
+            if plot and period_col:
+                with stage("plot"):
+                    plot_series(keys, frame["Boone"].to_numpy(), "boone", "Evolution of Boone Indicator (β) Over Time",
+                                "Boone Indicator (β)", "green", plot_dir, plot_format)
+
+            if bootstrap:
+                slopes = _bootstrap(bootstrap_ols, [X, y], keys, codes, bootstrap, seed, n_jobs, executor)
+                return _with_ci(frame, "Boone", slopes.sum(axis=2), ci, period_col)
 
-            return results
+            if _wants_frame(period_col, as_frame):
+                return frame
+            summary = summary_builders(X, y, codes, len(keys), cost_cols, profit_col) if inference else None
+            return {period: _compute_boone(g, summary) for g, period in enumerate(keys)}
 
         # Case: overall dataset
         else:
-            return _compute_boone(data)
+            summary = summary_builders(X, y, codes, len(keys), cost_cols, profit_col) if inference else None
+            return _compute_boone(0, summary)
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def rolling_panzar_rosse(data, revenue_col, input_cols, period_col, window, min_periods=None, filters=None):
+        """
+        Panzar-Rosse H-statistic over rolling windows of periods.
 
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            revenue_col (str): column with revenues
+            input_cols (list): list of column names for input prices
+            period_col (str or list): column for periods (month, year, etc.), or a
+                list such as ["Market", "Period"] to roll within each market
+                (windows never pool two markets; window_start and window_end are
+                then (market, period) tuples)
+            window (int): number of consecutive periods pooled in each window
+            min_periods (int): fewest periods for the leading windows (default: window)
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            pd.DataFrame: columns window_start, window_end, H, nobs; one row per
+                window, sliding by one period. Windows are built by adding and
+                removing per-period cross-products, so the cost is linear in the
+                number of periods.
+        """
+        keys, codes = group_codes(data, period_col)
+        X = log_design(data, input_cols)
+        y = log_column(data, revenue_col)
+        fit = rolling_ols(X, y, codes, len(keys), window, min_periods, _series_breaks(keys))
+        return _rolling_frame(keys, fit, "H")
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def rolling_boone(data, cost_cols, profit_col, period_col, window, min_periods=None, filters=None):
+        """
+        Boone indicator over rolling windows of periods.
+
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            cost_cols (list): list of columns with cost variables
+            profit_col (str): column with profits
+            period_col (str or list): column for periods (month, year, etc.), or a
+                list such as ["Market", "Period"] to roll within each market
+                (windows never pool two markets; window_start and window_end are
+                then (market, period) tuples)
+            window (int): number of consecutive periods pooled in each window
+            min_periods (int): fewest periods for the leading windows (default: window)
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            pd.DataFrame: columns window_start, window_end, Boone, one column per
+                cost variable (β_i), nobs; one row per window (see rolling_panzar_rosse)
+        """
+        keys, codes = group_codes(data, period_col)
+        X = log_design(data, cost_cols)
+        y = log_column(data, profit_col)
+        fit = rolling_ols(X, y, codes, len(keys), window, min_periods, _series_breaks(keys))
+        return _rolling_frame(keys, fit, "Boone", cost_cols)
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def panel_panzar_rosse(data, revenue_col, input_cols, firm_col, period_col=None, time_effects=False,
+                           cluster=None, inference=True, filters=None):
+        """
+        Panzar-Rosse H-statistic from a panel regression with firm fixed effects.
+
+        The fixed effects are swept out by demeaning (no dummy columns), so the
+        cost is linear in the number of rows whatever the number of firms.
+
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            revenue_col (str): column with revenues
+            input_cols (list): list of column names for input prices
+            firm_col (str): column with firm names (firm fixed effects)
+            period_col (str): column for periods, required with time_effects
+            time_effects (bool): also absorb period fixed effects (two-way FE)
+            cluster (str): column to cluster standard errors on (e.g. firm_col),
+                or None for homoskedastic standard errors (NaN if the column
+                holds a single cluster)
+            inference (bool): if False, skip standard errors
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            RegressionResult: {"H": value, "coefficients": dict of input elasticities},
+                with params (mean fixed effect first, then the elasticities), bse
+                (NaN for the mean fixed effect) and nobs; no summary. Estimates and
+                standard errors equal those of OLS with one dummy column per firm
+                (and period).
+        """
+        fit = _panel_fit(data, input_cols, revenue_col, firm_col, period_col, time_effects, cluster, inference)
+        return _panel_result(fit, "H", input_cols)
+
+
+    @staticmethod
+    @instrumented
+    @columnar
+    def panel_boone(data, cost_cols, profit_col, firm_col, period_col=None, time_effects=False,
+                    cluster=None, inference=True, filters=None):
+        """
+        Boone indicator from a panel regression with firm fixed effects.
+
+        Parameters:
+            data (pd.DataFrame): dataset, or a Parquet path, pyarrow Dataset or Arrow Table
+            cost_cols (list): list of columns with cost variables
+            profit_col (str): column with profits
+            firm_col, period_col, time_effects, cluster, inference: see panel_panzar_rosse
+            filters: with Parquet or Arrow input, pyarrow filters such as
+                [("Period", ">=", "2025-01-01")], applied before reading (prunes partitions)
+
+        Returns:
+            RegressionResult: {"Boone": β_global, "coefficients": dict of β_i}
+                (see panel_panzar_rosse)
+        """
+        fit = _panel_fit(data, cost_cols, profit_col, firm_col, period_col, time_effects, cluster, inference)
+        return _panel_result(fit, "Boone", cost_cols)
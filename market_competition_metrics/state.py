@@ -0,0 +1,211 @@
+# ==============================================================
+# state.py
+# Incremental computation of the four competition indicators.
+#
+# CompetitionState keeps per-period sufficient statistics:
+#   - HHI:           sum of s_i^2
+#   - Lerner:        sum of s_i * L_i
+#   - Panzar-Rosse:  Z'Z, Z'y, y'y of the log revenue regression
+#   - Boone:         Z'Z, Z'y, y'y of the log profit regression
+# All of them are additive over rows, so appending, retracting or
+# replacing rows only touches the periods those rows belong to.
+# Rows with a non-finite log (e.g. a zero cost) are kept out of the
+# moments and only counted, so the period reads NaN, as in the batch
+# methods, until they are retracted.
+# ==============================================================
+
+import pickle
+
+import numpy as np
+
+from ._ols import cross_products, group_codes, group_result, log_column, log_design, solve_moments
+
+
+class CompetitionState:
+    """
+    Stateful, incrementally updated version of MarketCompetitionMetrics.
+
+    Only the indicators whose columns are given are tracked. Column names
+    follow the same conventions as the MarketCompetitionMetrics methods.
+
+    Example:
+        state = CompetitionState("Period", share_col="Market_share",
+                                 price_col="Price", cost_col="Marginal_cost")
+        state.append(df_january)
+        state.save("state.pkl")
+        ...
+        state = CompetitionState.load("state.pkl")
+        state.append(df_february)
+        state.hhi()
+    """
+
+    _VERSION = 1
+
+    def __init__(self, period_col, share_col=None, price_col=None, cost_col=None,
+                 revenue_col=None, input_cols=None, profit_col=None, cost_cols=None):
+        self.period_col = period_col
+        self.share_col = share_col
+        self.price_col = price_col
+        self.cost_col = cost_col
+        self.revenue_col = revenue_col
+        self.input_cols = list(input_cols) if input_cols else None
+        self.profit_col = profit_col
+        self.cost_cols = list(cost_cols) if cost_cols else None
+        self._stats = {}  # {period: {statistic: value}}
+
+    @property
+    def periods(self):
+        """Sorted list of periods currently held."""
+        return sorted(self._stats)
+
+    def _tracked(self):
+        tracked = []
+        if self.share_col:
+            tracked.append("hhi")
+            if self.price_col and self.cost_col:
+                tracked.append("lerner")
+        if self.revenue_col and self.input_cols:
+            tracked.append("panzar_rosse")
+        if self.profit_col and self.cost_cols:
+            tracked.append("boone")
+        return tracked
+
+    def _group_statistics(self, data):
+        """Per-period statistics of ``data``: (periods, {statistic: array})."""
+        periods, codes = group_codes(data, self.period_col)
+        keep = codes >= 0
+        n = len(periods)
+        stats = {"nobs": np.bincount(codes[keep], minlength=n)}
+
+        for name in self._tracked():
+            if name == "hhi":
+                term = data[self.share_col].to_numpy(dtype=float) ** 2
+            elif name == "lerner":
+                price = data[self.price_col].to_numpy(dtype=float)
+                cost = data[self.cost_col].to_numpy(dtype=float)
+                term = data[self.share_col].to_numpy(dtype=float) * (price - cost) / price
+            else:
+                x_cols, y_col = (
+                    (self.input_cols, self.revenue_col) if name == "panzar_rosse"
+                    else (self.cost_cols, self.profit_col)
+                )
+                X = log_design(data, x_cols)
+                y = log_column(data, y_col)
+                finite = np.isfinite(X).all(axis=1) & np.isfinite(y)
+                stats[name] = cross_products(X, y, np.where(finite, codes, -1), n)
+                stats[f"{name}_nonfinite"] = np.bincount(codes[keep & ~finite], minlength=n)
+                continue
+            valid = keep & ~np.isnan(term)  # NaN terms are skipped, as in hhi() and lerner()
+            stats[name] = np.bincount(codes[valid], weights=term[valid], minlength=n)
+
+        return periods, stats
+
+    def _accumulate(self, data, sign):
+        periods, stats = self._group_statistics(data)
+        if sign < 0:
+            # Checked before anything is changed, so a failed retract keeps the state intact.
+            unknown = [period for period in periods if period not in self._stats]
+            if unknown:
+                raise KeyError(f"cannot retract rows from unknown period {unknown[0]!r}")
+        for g, period in enumerate(periods):
+            current = self._stats.get(period)
+            if current is None:
+                current = self._stats[period] = {}
+            for name, values in stats.items():
+                if isinstance(values, tuple):
+                    delta = tuple(sign * v[g] for v in values)
+                    old = current.get(name)
+                    current[name] = delta if old is None else tuple(o + d for o, d in zip(old, delta))
+                else:
+                    current[name] = current.get(name, 0) + sign * values[g]
+            if current["nobs"] <= 0:
+                del self._stats[period]
+        return self
+
+    def append(self, data):
+        """Add rows (new periods or extra rows of existing periods)."""
+        return self._accumulate(data, 1)
+
+    def retract(self, data):
+        """Remove rows previously passed to append() (e.g. before a correction)."""
+        return self._accumulate(data, -1)
+
+    def replace(self, data):
+        """Drop every period present in ``data`` and rebuild it from ``data``."""
+        periods, _ = group_codes(data, self.period_col)
+        for period in periods:
+            self._stats.pop(period, None)
+        return self._accumulate(data, 1)
+
+    def _require(self, name):
+        if name not in self._tracked():
+            raise ValueError(f"{name} is not tracked: the state was built without its columns")
+
+    def hhi(self):
+        """dict: {period: HHI}, as MarketCompetitionMetrics.hhi()."""
+        self._require("hhi")
+        return {p: self._stats[p]["hhi"] for p in self.periods}
+
+    def lerner(self):
+        """dict: {period: market Lerner index}, as MarketCompetitionMetrics.lerner()."""
+        self._require("lerner")
+        return {p: self._stats[p]["lerner"] for p in self.periods}
+
+    def _solve(self, name, inference):
+        self._require(name)
+        periods = self.periods
+        if not periods:
+            return periods, None
+        ztz, zty, yty = (np.stack(parts) for parts in zip(*(self._stats[p][name] for p in periods)))
+        fit = solve_moments(ztz, zty, yty, inference=inference)
+        # Periods holding non-finite rows get NaN estimates, as in grouped_ols.
+        nonfinite = np.array([self._stats[p].get(f"{name}_nonfinite", 0) for p in periods], dtype=np.intp)
+        invalid = nonfinite > 0
+        fit["params"][invalid] = np.nan
+        if fit["bse"] is not None:
+            fit["bse"][invalid] = np.nan
+        fit["nobs"] = fit["nobs"] + nonfinite
+        return periods, fit
+
+    def panzar_rosse(self, inference=True):
+        """
+        dict: {period: {"H": value}}, as MarketCompetitionMetrics.panzar_rosse().
+
+        Results carry params, bse and nobs but no summary, since the rows are not kept.
+        """
+        periods, fit = self._solve("panzar_rosse", inference)
+        return {
+            p: group_result(fit, g, {"H": np.sum(fit["params"][g, 1:])})
+            for g, p in enumerate(periods)
+        }
+
+    def boone(self, inference=True):
+        """
+        dict: {period: {"Boone": β_global, "coefficients": dict of β_i}},
+        as MarketCompetitionMetrics.boone() (without summary).
+        """
+        periods, fit = self._solve("boone", inference)
+        results = {}
+        for g, p in enumerate(periods):
+            betas = fit["params"][g, 1:]
+            results[p] = group_result(fit, g, {
+                "Boone": np.sum(betas),
+                "coefficients": dict(zip(self.cost_cols, betas)),
+            })
+        return results
+
+    def save(self, path):
+        """Write the state to ``path`` so a later job can resume from it."""
+        with open(path, "wb") as fh:
+            pickle.dump({"version": self._VERSION, "state": self.__dict__}, fh)
+
+    @classmethod
+    def load(cls, path):
+        """Read a state written by save()."""
+        with open(path, "rb") as fh:
+            payload = pickle.load(fh)
+        if payload.get("version") != cls._VERSION:
+            raise ValueError(f"unsupported CompetitionState version: {payload.get('version')!r}")
+        state = cls.__new__(cls)
+        state.__dict__.update(payload["state"])
+        return state
@@ -0,0 +1,87 @@
+# ==============================================================
+# synthetic.py
+# Scalable synthetic market data with the same schema as
+# Synthetic_Market_Data.csv, for benchmarks and examples.
+# ==============================================================
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = [
+    "Period", "Firm", "Revenue", "Profit", "Labor_cost", "Capital_cost",
+    "Wage_cost", "Price", "Marginal_cost", "Market_share", "Income",
+]
+
+
+def generate_market_data(n_firms=5, n_periods=3, n_markets=1, skew=1.0, seed=None, as_category=False):
+    """
+    Generate a synthetic firm-level panel.
+
+    Every market has the same n_firms in every period. Firm sizes follow a
+    Zipf-like profile (rank ** -skew) with log-normal noise, so a larger skew
+    gives a more concentrated market. Market shares are in percent and sum to
+    100 within each market and period; costs are fractions of revenue so that
+    profits, costs and prices are strictly positive (the regressions take logs).
+    Periods are labelled "P1", "P2", ... zero-padded so that they sort in
+    order; calendar dates would run out of the datetime64[ns] range past a few
+    thousand months.
+
+    Parameters:
+        n_firms (int): firms per market
+        n_periods (int): number of periods
+        n_markets (int): number of markets; adds a "Market" column if > 1
+        skew (float): concentration of the share distribution (0 = equal sizes)
+        seed (int): seed for np.random.default_rng
+        as_category (bool): return Period, Firm and Market as categoricals
+
+    Returns:
+        pd.DataFrame: n_markets * n_periods * n_firms rows, columns as in
+            Synthetic_Market_Data.csv (plus "Market")
+    """
+    rng = np.random.default_rng(seed)
+    n_groups = n_markets * n_periods
+    shape = (n_groups, n_firms)
+
+    weights = np.arange(1, n_firms + 1, dtype=float) ** -skew * rng.lognormal(0.0, 0.25, shape)
+    share = weights / weights.sum(axis=1, keepdims=True)
+    revenue = share * rng.uniform(5e5, 1e6, (n_groups, 1))
+
+    labor = revenue * rng.uniform(0.15, 0.35, shape)
+    capital = revenue * rng.uniform(0.10, 0.30, shape)
+    wage = revenue * rng.uniform(0.05, 0.25, shape)
+    price = rng.uniform(50.0, 120.0, shape)
+    marginal_cost = price * rng.uniform(0.3, 0.9, shape)
+
+    width = len(str(n_firms))
+    firms = pd.Index([f"Enter_{i:0{width}d}" for i in range(1, n_firms + 1)])
+    periods = pd.Index([f"P{i:0{len(str(n_periods))}d}" for i in range(1, n_periods + 1)])
+
+    group = np.arange(n_groups).repeat(n_firms)
+    columns = {
+        "Period": pd.Categorical.from_codes(group % n_periods, periods),
+        "Firm": pd.Categorical.from_codes(np.tile(np.arange(n_firms), n_groups), firms),
+    }
+    if n_markets > 1:
+        markets = pd.Index([f"Market_{m:0{len(str(n_markets))}d}" for m in range(1, n_markets + 1)])
+        columns["Market"] = pd.Categorical.from_codes(group // n_periods, markets)
+
+    revenue = revenue.ravel()
+    columns.update({
+        "Revenue": revenue,
+        "Profit": (revenue - labor.ravel() - capital.ravel() - wage.ravel()),
+        "Labor_cost": labor.ravel(),
+        "Capital_cost": capital.ravel(),
+        "Wage_cost": wage.ravel(),
+        "Price": price.ravel(),
+        "Marginal_cost": marginal_cost.ravel(),
+        "Market_share": share.ravel() * 100,
+        "Income": revenue,
+    })
+    df = pd.DataFrame(columns)
+    if not as_category:
+        for col in ("Period", "Firm", "Market"):
+            if col in df:
+                df[col] = df[col].astype(str)
+    order = ["Market"] + COLUMNS if n_markets > 1 else COLUMNS
+    return df[order]
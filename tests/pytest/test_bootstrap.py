@@ -0,0 +1,61 @@
+# tests/pytest/test_bootstrap.py
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from tests.pytest._helpers import _build_df, _expected_hhi
+
+
+def test_bootstrap_is_reproducible_and_split_independent():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=30, n_periods=12, seed=5)
+    args = dict(cost_cols=["Labor_cost", "Capital_cost"], profit_col="Profit", period_col="Period",
+                bootstrap=200, seed=11)
+    serial = M.boone(df, **args)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        pooled = M.boone(df, executor=pool, **args)
+    assert serial.equals(pooled)
+    assert not serial.equals(M.boone(df, **dict(args, seed=12)))
+    assert list(serial.columns[:3]) == ["Boone", "Boone_ci_low", "Boone_ci_high"]
+    assert (serial["Boone_ci_low"] < serial["Boone_ci_high"]).all()
+
+
+def test_bootstrap_spread_matches_standard_errors():
+    from market_competition_metrics._bootstrap import bootstrap_ols, bootstrap_sums
+    from market_competition_metrics._ols import grouped_ols
+
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 3, 3000)
+    X = rng.normal(size=(3000, 2))
+    y = X @ [1.0, 2.0] + rng.normal(size=3000)
+
+    slopes = bootstrap_ols(X, y, codes, codes, 3, 400, seed=1)
+    assert slopes.shape == (3, 400, 2)
+    bse = grouped_ols(X, y, codes, 3)["bse"][:, 1:]
+    assert np.allclose(slopes.std(axis=1), bse, rtol=0.2)
+
+    sums = bootstrap_sums(np.ones(3000), codes, codes, 3, 50, seed=1)
+    assert np.array_equal(sums, np.repeat(np.bincount(codes)[:, None], 50, axis=1))
+
+
+def test_bootstrap_frames_without_period():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _build_df()
+    hhi = M.hhi(df, "Market_share", "Period", bootstrap=100, seed=0)
+    assert np.allclose(hhi["HHI"], list(_expected_hhi.values()))
+    assert (hhi["HHI_ci_low"] <= hhi["HHI_ci_high"]).all()
+
+    overall = M.lerner(df, "Firm", "Price", "Marginal_cost", "Market_share", bootstrap=100, seed=0, ci=0.9)
+    assert list(overall.columns) == ["Lerner", "Lerner_ci_low", "Lerner_ci_high"] and len(overall) == 1
+
+
+def test_bootstrap_on_empty_data():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    empty = _build_df().iloc[:0]
+    hhi = M.hhi(empty, "Market_share", "Period", bootstrap=10, seed=1)
+    assert hhi.empty and list(hhi.columns) == ["HHI", "HHI_ci_low", "HHI_ci_high"]
+    boone = M.boone(empty, ["Labor_cost", "Capital_cost"], "Profit", "Period", bootstrap=10, seed=1)
+    assert boone.empty and "Boone_ci_high" in boone
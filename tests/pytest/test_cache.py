@@ -0,0 +1,127 @@
+# tests/pytest/test_cache.py
+import numpy as np
+from tests.pytest._helpers import _build_df, _expected
+
+
+def test_identical_calls_are_served_from_cache(tmp_path):
+    from market_competition_metrics import ResultCache
+
+    cache = ResultCache(directory=tmp_path)
+    df = _build_df()
+    first = cache.hhi(df, share_col="Market_share", period_col="Period")
+    assert cache.misses == 3 and cache.hits == 0
+    assert cache.hhi(df, "Market_share", "Period") == first
+    assert cache.hits == 3
+
+    # a fresh process with the same directory reads from disk
+    disk = ResultCache(directory=tmp_path)
+    assert disk.hhi(df, share_col="Market_share", period_col="Period") == first
+    assert disk.hits == 3 and disk.misses == 0
+
+
+def test_changed_rows_only_recompute_their_period():
+    from market_competition_metrics import ResultCache
+
+    cache = ResultCache()
+    df = _build_df()
+    args = dict(cost_cols=["Labor_cost", "Capital_cost", "Wage_cost"], profit_col="Profit", period_col="Period")
+    cache.boone(df, **args)
+
+    changed = df.copy()
+    changed.loc[changed["Period"] == "2025-03-01", "Profit"] *= 1.5
+    changed.loc[0, "Revenue"] = 1.0  # column boone does not read
+    res = cache.boone(changed, **args)
+    assert cache.misses == 4 and cache.hits == 2
+    assert np.isclose(res["2025-01-01"]["Boone"], _expected["boone"]["2025-01-01"], rtol=3e-3)
+    assert list(res) == list(_expected["boone"])
+
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    from market_competition_metrics import ResultCache
+
+    cache = ResultCache(max_entries=1, directory=tmp_path, max_bytes=1)
+    cache.lerner(_build_df(), firm_col="Firm", price_col="Price", cost_col="Marginal_cost",
+                 share_col="Market_share", period_col=["Period"])
+    assert len(cache._memory) == 1
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 1
+
+    full = ResultCache(directory=tmp_path)
+    full.hhi(_build_df(), "Market_share", "Period")
+    sizes = sorted(f.stat().st_size for f in tmp_path.iterdir())
+    assert len(sizes) == 3 and full._disk_bytes == sum(sizes)
+    small = ResultCache(directory=tmp_path, max_bytes=sum(sizes[:2]))
+    small.hhi(_build_df(), "Market_share", "Period")  # all hits, still evicts once
+    assert small.hits == 3 and len(list(tmp_path.iterdir())) == 2
+
+
+def test_cached_results_are_returned_as_copies():
+    from market_competition_metrics import ResultCache
+
+    cache = ResultCache()
+    df = _build_df()
+    args = dict(revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period")
+    expected = cache.panzar_rosse(df, **args)["2025-01-01"]["H"]
+    hit = cache.panzar_rosse(df, **args)
+    hit["2025-01-01"]["H"] = 999
+    hit["2025-01-01"].params[:] = 0
+    again = cache.panzar_rosse(df, **args)["2025-01-01"]
+    assert again["H"] == expected and again.params.any()
+
+
+def test_fingerprints_use_two_independent_sums():
+    import pandas as pd
+    from market_competition_metrics import ResultCache
+
+    frame = pd.DataFrame({"x": np.arange(8.0)})
+    codes = np.repeat([0, 1], 4)
+    sums, mixed = zip(*(fp.split(":")[1:] for fp in ResultCache._fingerprints(frame, codes, 2)))
+    multiple = [f"{int(s, 16) * 0x9E3779B97F4A7C15 % 2**64:016x}" for s in sums]
+    assert list(mixed) != multiple
+    shuffled = ResultCache._fingerprints(frame.iloc[::-1].reset_index(drop=True), codes[::-1], 2)
+    assert shuffled == ResultCache._fingerprints(frame, codes, 2)
+
+
+def test_bootstrap_intervals_survive_partial_recomputation():
+    from market_competition_metrics import MarketCompetitionMetrics as M, ResultCache
+
+    cache = ResultCache()
+    df = _build_df()
+    cache.hhi(df, "Market_share", "Period", bootstrap=200, seed=4)
+
+    changed = df.copy()
+    changed.loc[changed["Period"] == "2025-02-01", "Market_share"] *= 1.1
+    cached = cache.hhi(changed, "Market_share", "Period", bootstrap=200, seed=4)
+    assert cache.misses == 4 and cache.hits == 2
+    assert cached.equals(M.hhi(changed, "Market_share", "Period", bootstrap=200, seed=4))
+
+    # Without a seed every call draws afresh and nothing is cached.
+    first = cache.hhi(df, "Market_share", "Period", bootstrap=200)
+    second = cache.hhi(df, "Market_share", "Period", bootstrap=200)
+    assert cache.misses == 4 and cache.hits == 2
+    assert not first["HHI_ci_low"].equals(second["HHI_ci_low"])
+
+
+def test_empty_data_bypasses_the_cache():
+    from market_competition_metrics import MarketCompetitionMetrics as M, ResultCache
+
+    cache = ResultCache()
+    empty = _build_df().iloc[:0]
+    assert cache.hhi(empty, "Market_share", "Period") == M.hhi(empty, "Market_share", "Period") == {}
+    frame = cache.boone(empty, ["Labor_cost", "Capital_cost"], "Profit", ["Period"], inference=False)
+    assert frame.empty and cache.hits == cache.misses == 0
+
+
+def test_cached_results_keep_their_summary(tmp_path):
+    from market_competition_metrics import ResultCache
+
+    cache = ResultCache(directory=tmp_path)
+    args = dict(revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period")
+    first = cache.panzar_rosse(_build_df(), **args)
+    assert "OLS Regression Results" in str(first["2025-01-01"]["summary"])
+
+    cached = cache.panzar_rosse(_build_df(), **args)
+    disk = ResultCache(directory=tmp_path).panzar_rosse(_build_df(), **args)
+    assert cache.hits == 3
+    for res in (cached, disk):
+        assert list(res["2025-01-01"]) == ["H", "summary"]
+        assert res["2025-01-01"]["summary"].tables[1].as_text() == first["2025-01-01"]["summary"].tables[1].as_text()
@@ -0,0 +1,73 @@
+# tests/pytest/test_concentration.py
+import numpy as np
+import pytest
+from tests.pytest._helpers import _build_df, _expected_hhi
+
+
+def _reference(shares):
+    s = np.sort(shares)[::-1]
+    p = s / s.sum()
+    n = len(s)
+    entropy = -np.sum(p * np.log(p))
+    gini = np.abs(p[:, None] - p[None, :]).sum() / (2 * n * p.sum())  # mean absolute difference form
+    return {
+        "CR4": s[:4].sum(), "CR2": s[:2].sum(), "HHI": np.sum(s ** 2), "equivalent": 1 / np.sum(p ** 2),
+        "entropy": entropy, "theil": np.log(n) - entropy, "gini": gini,
+    }
+
+
+def test_concentration_matches_reference_definitions():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=9, n_periods=3, n_markets=2, skew=1.2, seed=8).sample(frac=1, random_state=1)
+    measures = ["CR4", "CR2", "HHI", "equivalent", "entropy", "theil", "gini"]
+    res = MarketCompetitionMetrics.concentration(df, "Market_share", ["Market", "Period"], measures=measures)
+    assert list(res.columns) == measures
+    for key, group in df.groupby(["Market", "Period"]):
+        expected = _reference(group["Market_share"].to_numpy())
+        assert np.allclose(res.loc[key, measures].to_numpy(dtype=float), [expected[m] for m in measures])
+
+
+def test_concentration_defaults_and_single_group():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from market_competition_metrics.market_competition_metrics import CONCENTRATION_MEASURES
+
+    df = _build_df()
+    res = MarketCompetitionMetrics.concentration(df, "Market_share", "Period")
+    assert tuple(res.columns) == CONCENTRATION_MEASURES
+    assert np.allclose(res["HHI"], list(_expected_hhi.values()))
+    assert np.allclose(res["equivalent"], 10000 / res["HHI"], rtol=1e-3)
+    assert np.allclose(res["CR8"], 100, rtol=1e-6)
+
+    overall = MarketCompetitionMetrics.concentration(df[df["Period"] == "2025-01-01"], "Market_share")
+    assert len(overall) == 1 and np.isclose(overall["HHI"].iloc[0], _expected_hhi["2025-01-01"], rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        MarketCompetitionMetrics.concentration(df, "Market_share", measures=["variance"])
+
+
+def test_concentration_skips_missing_shares():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    df.loc[0, "Market_share"] = np.nan
+    period = df.loc[0, "Period"]
+    res = MarketCompetitionMetrics.concentration(df, "Market_share", "Period")
+    assert res.notna().all().all()
+    assert np.isclose(res.loc[period, "HHI"], MarketCompetitionMetrics.hhi(df, "Market_share", "Period")[period])
+    complete = MarketCompetitionMetrics.concentration(df.dropna(subset=["Market_share"]), "Market_share", "Period")
+    assert np.allclose(res.to_numpy(dtype=float), complete.to_numpy(dtype=float))
+
+
+def test_concentration_measure_names_are_case_insensitive():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    res = MarketCompetitionMetrics.concentration(df, "Market_share", "Period", measures=["cr2", "hhi", "Gini"])
+    assert list(res.columns) == ["CR2", "HHI", "gini"]
+    assert np.allclose(res["HHI"], list(_expected_hhi.values()))
+
+    for name in ["CRx", "CR0", "CR"]:
+        with pytest.raises(ValueError, match="unknown concentration measure"):
+            MarketCompetitionMetrics.concentration(df, "Market_share", measures=[name])
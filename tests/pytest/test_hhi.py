@@ -11,3 +11,22 @@ def test_hhi(period, expected):
     res = MarketCompetitionMetrics.hhi(df, share_col="Market_share", period_col="Period", plot=False)
     value = _extract_period_value(res, period, key_candidates=["HHI","hhi","HHI_t","value","hhi_t"])
     assert np.isclose(value, expected, rtol=1e-3, atol=1e-6), f"HHI mismatch for {period}: got {value}, expected {expected}"
+
+
+def test_hhi_skips_missing_shares():
+    from market_competition_metrics import MarketCompetitionMetrics, CompetitionState
+
+    df = _build_df()
+    df.loc[0, "Market_share"] = np.nan
+    period = df.loc[0, "Period"]
+    expected = np.nansum(df.loc[df["Period"] == period, "Market_share"] ** 2)
+
+    res = MarketCompetitionMetrics.hhi(df, "Market_share", "Period")
+    assert np.isclose(res[period], expected)
+    assert np.isclose(MarketCompetitionMetrics.hhi(df, "Market_share"), np.nansum(df["Market_share"] ** 2))
+    assert np.isclose(MarketCompetitionMetrics.hhi_stream(df, "Market_share", "Period")[period], expected)
+    state = CompetitionState("Period", share_col="Market_share")
+    state.append(df)
+    assert np.isclose(state.hhi()[period], expected)
+    boot = MarketCompetitionMetrics.hhi(df, "Market_share", "Period", bootstrap=50, seed=0)
+    assert boot[["HHI_ci_low", "HHI_ci_high"]].notna().all().all()
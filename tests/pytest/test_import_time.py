@@ -0,0 +1,25 @@
+# tests/pytest/test_import_time.py
+import json
+import subprocess
+import sys
+
+# Import cost of the package itself, on top of numpy and pandas which every
+# caller needs anyway. Plotting and statsmodels must not be paid at import.
+_IMPORT_BUDGET_S = 0.25
+
+_SCRIPT = """
+import json, sys, time
+import numpy, pandas
+start = time.perf_counter()
+import market_competition_metrics
+elapsed = time.perf_counter() - start
+heavy = [m for m in ("matplotlib", "statsmodels", "scipy") if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+
+def test_import_is_fast_and_lazy():
+    out = subprocess.run([sys.executable, "-c", _SCRIPT], capture_output=True, text=True, check=True)
+    report = json.loads(out.stdout)
+    assert report["heavy"] == []
+    assert report["elapsed"] < _IMPORT_BUDGET_S, f"import took {report['elapsed']:.3f}s"
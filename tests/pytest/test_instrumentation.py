@@ -0,0 +1,36 @@
+# tests/pytest/test_instrumentation.py
+import json
+
+from tests.pytest._helpers import _build_df
+
+
+def test_collector_records_stages_of_each_method(tmp_path):
+    from market_competition_metrics import MarketCompetitionMetrics as M
+    from market_competition_metrics.instrumentation import Collector
+
+    df = _build_df()
+    with Collector(allocations=True) as prof:
+        res = M.boone(df, cost_cols=["Labor_cost", "Capital_cost"], profit_col="Profit", period_col="Period")
+        res["2025-01-01"]["summary"]
+        M.hhi(df, share_col="Market_share", period_col="Period")
+
+    events = {event["path"]: event for event in prof.events}
+    assert {"boone", "boone/group", "boone/log", "boone/solve", "hhi", "hhi/group", "summary"} <= set(events)
+    assert events["boone"]["rows"] == 15 and events["boone/group"]["groups"] == 3
+    assert events["boone/solve"]["depth"] == 1 and "peak_bytes" in events["boone/solve"]
+
+    summary = prof.summary()
+    assert summary.loc["boone/log", "calls"] == 2
+
+    assert json.loads(prof.to_json(tmp_path / "profile.json"))[0]["path"] == "boone/group"
+    folded = prof.to_collapsed(tmp_path / "profile.folded").splitlines()
+    assert any(line.startswith("boone;solve ") for line in folded)
+
+
+def test_disabled_instrumentation_is_a_shared_no_op():
+    from market_competition_metrics.instrumentation import _HOOKS, _NULL_STAGE, stage
+
+    assert not _HOOKS
+    with stage("anything", rows=1) as st:
+        st.set(groups=2)
+    assert st is _NULL_STAGE
@@ -21,3 +21,20 @@ def test_lerner(period, expected):
 
     value = _extract_period_value(res, period, key_candidates=["Lerner","lerner","L","L_t","value"])
     assert np.isclose(value, expected, rtol=2e-3, atol=1e-6), f"Lerner mismatch for {period}: got {value}, expected {expected}"
+
+
+def test_lerner_skips_missing_prices():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _build_df()
+    df.loc[0, "Price"] = np.nan
+    period = df.loc[0, "Period"]
+    terms = df["Market_share"] * (df["Price"] - df["Marginal_cost"]) / df["Price"]
+    args = dict(firm_col="Firm", price_col="Price", cost_col="Marginal_cost", share_col="Market_share")
+
+    res = M.lerner(df, period_col="Period", **args)
+    assert np.isclose(res[period], terms[df["Period"] == period].sum())
+    assert np.isclose(M.lerner(df, **args)["overall_market"], terms.sum())
+    assert np.isclose(M.lerner_contributions(df, period_col="Period", **args)[period].sum(), res[period])
+    stream = M.lerner_stream(df, "Price", "Marginal_cost", "Market_share", "Period")
+    assert np.isclose(stream[period], res[period])
@@ -0,0 +1,37 @@
+# tests/pytest/test_lerner_contributions.py
+import numpy as np
+from tests.pytest._helpers import _build_df, _expected
+
+
+def test_lerner_contributions_sum_to_market_index():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df().iloc[1:]  # Enter_A missing from the first period
+    matrix = MarketCompetitionMetrics.lerner_contributions(
+        df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost",
+        share_col="Market_share", period_col="Period"
+    )
+    assert list(matrix.index) == ["Enter_A", "Enter_B", "Enter_C", "Enter_D", "Enter_E"]
+    assert list(matrix.columns) == list(_expected["lerner"])
+    assert matrix.loc["Enter_A", "2025-01-01"] == 0
+
+    market = MarketCompetitionMetrics.lerner(
+        df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost",
+        share_col="Market_share", period_col="Period"
+    )
+    assert np.allclose(matrix.sum().to_numpy(), list(market.values()))
+    assert np.isclose(market["2025-02-01"], _expected["lerner"]["2025-02-01"], rtol=2e-3)
+
+
+def test_lerner_contributions_without_period():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    matrix = MarketCompetitionMetrics.lerner_contributions(
+        df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost", share_col="Market_share"
+    )
+    overall = MarketCompetitionMetrics.lerner(
+        df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost", share_col="Market_share"
+    )
+    assert list(matrix.columns) == ["overall_market"]
+    assert np.isclose(matrix["overall_market"].sum(), overall["overall_market"])
@@ -0,0 +1,65 @@
+# tests/pytest/test_low_memory.py
+import tracemalloc
+
+import numpy as np
+import pytest
+from tests.pytest._helpers import (
+    _build_df, _expected_panzar_H, _expected_boone
+)
+
+# The regressions use float32 buffers and lose a little to the log transform.
+RTOL_OLS = 1e-3
+
+
+def test_low_memory_matches_reference_values():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _build_df()
+    pr = M.panzar_rosse(df, "Revenue", ["Labor_cost", "Capital_cost"], "Period", low_memory=True)
+    boone = M.boone(df, ["Labor_cost", "Capital_cost", "Wage_cost"], "Profit", "Period", low_memory=True)
+
+    for period in _expected_panzar_H:
+        assert np.isclose(pr[period]["H"], _expected_panzar_H[period], rtol=RTOL_OLS)
+        assert np.isclose(boone[period]["Boone"], _expected_boone[period], rtol=RTOL_OLS)
+    assert "OLS Regression Results" in str(boone["2025-01-01"]["summary"])
+
+
+def _compute_all(*args, **kwargs):
+    from market_competition_metrics import compute_all
+
+    return compute_all(*args, **kwargs)
+
+
+COST_COLS = ["Labor_cost", "Capital_cost", "Wage_cost"]
+LERNER = {"price_col": "Price", "cost_col": "Marginal_cost", "share_col": "Market_share"}
+CALLS = {
+    "panzar_rosse": lambda M, df, lm: M.panzar_rosse(df, "Revenue", COST_COLS[:2], "Period", inference=False,
+                                                     as_frame=True, low_memory=lm)["H"],
+    "boone": lambda M, df, lm: M.boone(df, COST_COLS, "Profit", "Period", inference=False,
+                                       as_frame=True, low_memory=lm)["Boone"],
+    "compute_all": lambda M, df, lm: _compute_all(
+        df, "Period", hhi={"share_col": "Market_share"}, lerner=LERNER,
+        boone={"cost_cols": COST_COLS, "profit_col": "Profit"}, inference=False, low_memory=lm
+    )["boone"]["Boone"],
+}
+
+
+@pytest.mark.parametrize("method", list(CALLS))
+def test_low_memory_lowers_peak_allocation(method):
+    from market_competition_metrics import MarketCompetitionMetrics as M
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=200, n_periods=250, seed=0)
+
+    def peak(low_memory):
+        tracemalloc.start()
+        try:
+            result = CALLS[method](M, df, low_memory)
+            return tracemalloc.get_traced_memory()[1], result
+        finally:
+            tracemalloc.stop()
+
+    full_peak, full = peak(False)
+    low_peak, low = peak(True)
+    assert low_peak < 0.75 * full_peak
+    assert np.allclose(low, full, rtol=RTOL_OLS, atol=1e-4)
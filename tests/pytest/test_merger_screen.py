@@ -0,0 +1,76 @@
+# tests/pytest/test_merger_screen.py
+from itertools import combinations
+
+import numpy as np
+from tests.pytest._helpers import _build_df, _expected_hhi
+
+
+def _brute_force(df, delta_threshold, hhi_threshold):
+    pairs = set()
+    for (market, period), group in df.groupby(["Market", "Period"]):
+        shares = dict(zip(group["Firm"], group["Market_share"]))
+        hhi = sum(s ** 2 for s in shares.values())
+        for a, b in combinations(shares, 2):
+            delta = 2 * shares[a] * shares[b]
+            if delta > delta_threshold and hhi + delta > hhi_threshold:
+                pairs.add((market, period, frozenset((a, b)), round(delta, 6)))
+    return pairs
+
+
+def test_merger_screen_matches_brute_force_and_top_k():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=12, n_periods=4, n_markets=3, skew=1.5, seed=3)
+    screen = MarketCompetitionMetrics.merger_screen(
+        df, "Firm", "Market_share", ["Market", "Period"], delta_threshold=100, hhi_threshold=1500
+    )
+    found = {
+        (market, period, frozenset((a, b)), round(delta, 6))
+        for (market, period), a, b, delta in zip(screen.index, screen["firm_a"], screen["firm_b"], screen["delta_hhi"])
+    }
+    assert found == _brute_force(df, 100, 1500)
+    assert (screen["share_a"] >= screen["share_b"]).all()
+    assert np.allclose(screen["post_merger_hhi"], screen["hhi"] + screen["delta_hhi"])
+
+    top = MarketCompetitionMetrics.merger_screen(
+        df, "Firm", "Market_share", ["Market", "Period"], delta_threshold=None, hhi_threshold=None, top_k=4
+    )
+    for key, group in top.groupby(level=[0, 1]):
+        shares = np.sort(df.set_index(["Market", "Period"]).loc[key, "Market_share"].to_numpy())[::-1]
+        everything = np.sort([2 * a * b for a, b in combinations(shares, 2)])[::-1]
+        assert np.allclose(group["delta_hhi"].to_numpy(), everything[:4])
+
+
+def test_merger_screen_single_period_and_no_pairs():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    period = df[df["Period"] == "2025-01-01"]
+    screen = MarketCompetitionMetrics.merger_screen(period, "Firm", "Market_share", top_k=1)
+    assert len(screen) == 1
+    assert {screen["firm_a"].iloc[0], screen["firm_b"].iloc[0]} == {"Enter_E", "Enter_A"}
+    assert np.isclose(screen["hhi"].iloc[0], _expected_hhi["2025-01-01"], rtol=1e-6)
+
+    none = MarketCompetitionMetrics.merger_screen(df, "Firm", "Market_share", "Period", delta_threshold=5000)
+    assert none.empty and list(none.columns)[-1] == "post_merger_hhi"
+
+
+def test_merger_screen_skips_missing_shares():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    df.loc[0, "Market_share"] = np.nan
+    period = df.loc[0, "Period"]
+    screen = MarketCompetitionMetrics.merger_screen(df, "Firm", "Market_share", "Period", hhi_threshold=2500)
+    assert screen["post_merger_hhi"].notna().all() and (screen["post_merger_hhi"] > 2500).all()
+    hhi = MarketCompetitionMetrics.hhi(df, "Market_share", "Period")[period]
+    assert np.allclose(screen.loc[[period], "hhi"], hhi)
+    complete = df.dropna(subset=["Market_share"])
+    expected = MarketCompetitionMetrics.merger_screen(complete, "Firm", "Market_share", "Period", hhi_threshold=2500)
+    assert screen.equals(expected)
+
+    from market_competition_metrics._merger import screen_pairs
+
+    pairs = screen_pairs(np.array([60.0, np.nan, 30.0, 10.0]), np.zeros(4, dtype=np.intp), 1, None, 6000, None)
+    assert np.isclose(pairs["hhi"][0], 4600) and np.allclose(pairs["delta"], [3600])
@@ -0,0 +1,142 @@
+# tests/pytest/test_ols.py
+import numpy as np
+import statsmodels.api as sm
+from market_competition_metrics._ols import grouped_ols
+
+
+def _random_groups(seed=0, n_groups=6, size=12, k=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_groups * size, k))
+    y = X @ rng.normal(size=k) + rng.normal(scale=0.1, size=n_groups * size)
+    codes = np.repeat(np.arange(n_groups), size)
+    return X, y, codes
+
+
+def test_grouped_ols_matches_statsmodels():
+    X, y, codes = _random_groups()
+    fit = grouped_ols(X, y, codes, 6)
+    for g in range(6):
+        rows = codes == g
+        ref = sm.OLS(y[rows], sm.add_constant(X[rows])).fit().params
+        assert np.allclose(fit["params"][g], ref, rtol=1e-10, atol=1e-12)
+    assert not fit["fallback"].any()
+
+
+def test_grouped_ols_rank_deficient_group_falls_back():
+    X, y, codes = _random_groups()
+    X[codes == 2, 2] = 2 * X[codes == 2, 0]  # collinear regressors in one group
+    fit = grouped_ols(X, y, codes, 6)
+    assert fit["fallback"].tolist() == [False, False, True, False, False, False]
+    rows = codes == 2
+    ref = sm.OLS(y[rows], sm.add_constant(X[rows])).fit().params
+    assert np.allclose(fit["params"][2], ref)
+
+
+def test_grouped_ols_standard_errors_match_statsmodels():
+    X, y, codes = _random_groups(seed=1)
+    fit = grouped_ols(X, y, codes, 6)
+    for g in range(6):
+        rows = codes == g
+        ref = sm.OLS(y[rows], sm.add_constant(X[rows])).fit().bse
+        assert np.allclose(fit["bse"][g], ref, rtol=1e-8)
+    assert grouped_ols(X, y, codes, 6, inference=False)["bse"] is None
+
+
+def test_summary_is_built_lazily():
+    from tests.pytest._helpers import _build_df
+    from market_competition_metrics import MarketCompetitionMetrics, RegressionResult
+
+    res = MarketCompetitionMetrics.panzar_rosse(
+        _build_df(), revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period"
+    )["2025-01-01"]
+    assert isinstance(res, RegressionResult) and res.nobs == 5
+    assert res.rank == 3 and res.df_resid == 2 and res.cond > 1
+    assert "summary" in res and "summary" not in dict.keys(res)
+    assert list(res) == list(res.keys()) == ["H", "summary"] and len(res) == 2
+    assert "Revenue" in str(res["summary"])
+
+    import copy
+    import pickle
+
+    res = MarketCompetitionMetrics.boone(
+        _build_df(), cost_cols=["Labor_cost", "Capital_cost"], profit_col="Profit", period_col="Period"
+    )["2025-02-01"]
+    for clone in (copy.deepcopy(res), pickle.loads(pickle.dumps(res))):
+        assert list(clone) == ["Boone", "coefficients", "summary"]
+        assert clone._summary.X.shape[0] == 5  # only the group's rows travel
+        assert clone["summary"].tables[1].as_text() == res["summary"].tables[1].as_text()
+
+    res = MarketCompetitionMetrics.boone(
+        _build_df(), cost_cols=["Labor_cost", "Capital_cost"], profit_col="Profit", inference=False
+    )
+    assert res.bse is None and "summary" not in res and res.get("summary") is None
+
+
+def test_rank_condition_and_degrees_of_freedom_match_statsmodels():
+    X, y, codes = _random_groups(seed=2, size=6)
+    X[codes == 1, 1] = X[codes == 1, 0] - 3 * X[codes == 1, 2]  # rank 3 of 4
+    keep = (codes != 4) | (np.arange(len(codes)) % 6 < 3)  # 3 rows, fewer than k + 1
+    fit = grouped_ols(X[keep], y[keep], codes[keep], 6)
+    for g in range(6):
+        rows = codes[keep] == g
+        ref = sm.OLS(y[keep][rows], sm.add_constant(X[keep][rows])).fit()
+        assert fit["rank"][g] == np.linalg.matrix_rank(ref.model.exog)
+        assert fit["df_resid"][g] == ref.df_resid
+        assert np.allclose(fit["params"][g], ref.params)
+        if g not in (1, 4):
+            assert np.isclose(fit["cond"][g], ref.condition_number, rtol=1e-6)
+            assert np.allclose(fit["bse"][g], ref.bse)
+    assert fit["degenerate"].tolist() == [False, True, False, False, True, False]
+    assert np.isnan(fit["bse"][4]).all()
+
+
+def test_many_tiny_degenerate_groups_are_solved_in_bulk():
+    from market_competition_metrics.instrumentation import Collector
+
+    rng = np.random.default_rng(3)
+    n_groups = 20000
+    sizes = rng.integers(2, 7, n_groups)
+    codes = rng.permutation(np.repeat(np.arange(n_groups), sizes))
+    X = rng.normal(size=(len(codes), 2))
+    X[codes % 2 == 0, 1] = X[codes % 2 == 0, 0]  # every other group collinear
+    y = X[:, 0] + rng.normal(size=len(codes))
+
+    with Collector() as prof:
+        fit = grouped_ols(X, y, codes, n_groups)
+    assert fit["degenerate"][::2].all() and (fit["rank"][::2] == 2).all()
+    assert not fit["degenerate"][1::2][sizes[1::2] > 3].any()
+    svd = [e for e in prof.events if e["stage"] == "svd"]
+    assert len(svd) == 1 and svd[0]["groups"] >= n_groups // 2
+
+    g = 10
+    rows = codes == g
+    ref = sm.OLS(y[rows], sm.add_constant(X[rows])).fit()
+    assert np.allclose(fit["params"][g], ref.params)
+
+
+def test_non_finite_rows_only_flag_their_group():
+    import warnings
+    from tests.pytest._helpers import _build_df
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    X, y, codes = _random_groups(seed=4)
+    X[np.flatnonzero(codes == 1)[0], 0] = -np.inf
+    X[np.flatnonzero(codes == 3)[0], 2] = np.nan
+    y[np.flatnonzero(codes == 5)[0]] = np.inf
+    reference = grouped_ols(*_random_groups(seed=4), 6)
+    for inference in (True, False):
+        fit = grouped_ols(X, y, codes, 6, inference=inference)
+        bad = [False, True, False, True, False, True]
+        assert fit["degenerate"].tolist() == bad and not fit["fallback"].any()
+        assert np.isnan(fit["params"][bad]).all() and np.isnan(fit["cond"][bad]).all()
+        assert (fit["rank"][bad] == 0).all()
+        good = np.logical_not(bad)
+        assert np.allclose(fit["params"][good], reference["params"][good])
+
+    df = _build_df()
+    df.loc[0, "Labor_cost"] = 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        frame = M.panzar_rosse(df, "Revenue", ["Labor_cost", "Capital_cost"], "Period", as_frame=True)
+    assert frame["degenerate"].tolist() == [True, False, False]
+    assert np.isnan(frame["H"].iloc[0]) and frame["H"].iloc[1:].notna().all()
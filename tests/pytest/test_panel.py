@@ -0,0 +1,51 @@
+# tests/pytest/test_panel.py
+import numpy as np
+import pandas as pd
+from tests.pytest._helpers import _build_df, _expected
+
+
+def _two_markets():
+    a = _build_df().assign(Market="North")
+    b = _build_df().assign(Market="South")
+    b["Market_share"] = b["Market_share"][::-1].to_numpy()
+    return pd.concat([b, a], ignore_index=True)
+
+
+def test_hhi_and_lerner_frames_indexed_by_keys():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _two_markets()
+    hhi = M.hhi(df, share_col="Market_share", period_col=["Market", "Period"])
+    assert isinstance(hhi, pd.DataFrame) and list(hhi.index.names) == ["Market", "Period"]
+    assert hhi.index[0] == ("North", "2025-01-01")
+    for period, expected in _expected["hhi"].items():
+        assert np.isclose(hhi.loc[("North", period), "HHI"], expected, rtol=1e-3)
+
+    lerner = M.lerner(df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost",
+                      share_col="Market_share", period_col=["Market", "Period"])
+    assert np.isclose(lerner.loc[("North", "2025-03-01"), "Lerner"], _expected["lerner"]["2025-03-01"], rtol=2e-3)
+
+    # dict view keyed by tuples stays available
+    as_dict = M.hhi(df, share_col="Market_share", period_col=["Market", "Period"], as_frame=False)
+    assert as_dict == hhi["HHI"].to_dict()
+
+
+def test_regression_frames_match_dict_output():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _build_df()
+    frame = M.panzar_rosse(df, revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"],
+                           period_col=["Period"])
+    assert list(frame.columns) == ["H", "Labor_cost", "Capital_cost",
+                                   "const_se", "Labor_cost_se", "Capital_cost_se", "nobs",
+                                   "df_resid", "rank", "cond", "degenerate"]
+    assert np.allclose(frame["H"], list(_expected["panzar"].values()), rtol=2e-3)
+
+    boone = M.boone(_two_markets(), cost_cols=["Labor_cost", "Capital_cost", "Wage_cost"],
+                    profit_col="Profit", period_col=["Market", "Period"], inference=False)
+    assert "Wage_cost_se" not in boone
+    assert np.allclose(boone.xs("South")["Boone"], list(_expected["boone"].values()), rtol=3e-3)
+
+    as_dict = M.boone(df, cost_cols=["Labor_cost", "Capital_cost", "Wage_cost"], profit_col="Profit",
+                      period_col="Period", as_frame=True)
+    assert as_dict.index.name == "Period" and as_dict["nobs"].tolist() == [5, 5, 5]
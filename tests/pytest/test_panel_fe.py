@@ -0,0 +1,66 @@
+# tests/pytest/test_panel_fe.py
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("time_effects", [False, True])
+@pytest.mark.parametrize("cluster", [None, "Firm"])
+def test_within_estimator_matches_dummy_ols(time_effects, cluster):
+    import statsmodels.formula.api as smf
+    from market_competition_metrics import MarketCompetitionMetrics
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=25, n_periods=10, seed=4)
+    df = df.drop(index=df.sample(30, random_state=0).index)  # unbalanced panel
+    cost_cols = ["Labor_cost", "Capital_cost", "Wage_cost"]
+
+    res = MarketCompetitionMetrics.panel_boone(
+        df, cost_cols, "Profit", "Firm", "Period", time_effects=time_effects, cluster=cluster
+    )
+
+    logs = pd.DataFrame({col: np.log(df[col]) for col in cost_cols + ["Profit"]}).assign(
+        Firm=df["Firm"], Period=df["Period"]
+    )
+    formula = "Profit ~ " + " + ".join(cost_cols) + " + C(Firm)" + (" + C(Period)" if time_effects else "")
+    fit_kwargs = {"cov_type": "cluster", "cov_kwds": {"groups": pd.factorize(df["Firm"])[0]}} if cluster else {}
+    ref = smf.ols(formula, logs).fit(**fit_kwargs)
+
+    assert res.nobs == len(df)
+    assert np.allclose(res.params[1:], ref.params[cost_cols])
+    assert np.allclose(res.bse[1:], ref.bse[cost_cols])
+    assert np.isclose(res["Boone"], ref.params[cost_cols].sum())
+    assert list(res["coefficients"]) == cost_cols
+
+
+def test_panel_panzar_rosse_without_inference():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from tests.pytest._helpers import _build_df
+
+    res = MarketCompetitionMetrics.panel_panzar_rosse(
+        _build_df(), "Revenue", ["Labor_cost", "Capital_cost"], "Firm", inference=False
+    )
+    assert res.bse is None and res.nobs == 15
+    assert np.isclose(res["H"], sum(res["coefficients"].values()))
+    assert "summary" not in res
+
+
+def test_single_cluster_gives_nan_standard_errors():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from tests.pytest._helpers import _build_df
+
+    res = MarketCompetitionMetrics.panel_panzar_rosse(
+        _build_df().assign(Country="MA"), "Revenue", ["Labor_cost", "Capital_cost"], "Firm", cluster="Country"
+    )
+    assert np.isfinite(res["H"])
+    assert np.isnan(res.bse).all()
+
+
+def test_time_effects_require_period_col():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from tests.pytest._helpers import _build_df
+
+    with pytest.raises(ValueError, match="period_col"):
+        MarketCompetitionMetrics.panel_boone(
+            _build_df(), ["Labor_cost", "Capital_cost"], "Profit", "Firm", time_effects=True
+        )
@@ -0,0 +1,43 @@
+# tests/pytest/test_parallel.py
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from tests.pytest._helpers import _build_df
+
+
+def _many_periods(n_periods=40):
+    base = _build_df()
+    rng = np.random.default_rng(0)
+    frames = []
+    for t in range(n_periods):
+        df = base.copy()
+        df["Period"] = f"P{t:03d}"
+        for col in ["Revenue", "Profit", "Labor_cost", "Capital_cost", "Wage_cost", "Price"]:
+            df[col] = df[col] * rng.uniform(0.8, 1.2, len(df))
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def test_parallel_results_identical_to_serial():
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _many_periods()
+    pr_args = dict(revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period")
+    boone_args = dict(cost_cols=["Labor_cost", "Capital_cost", "Wage_cost"], profit_col="Profit", period_col="Period")
+    lerner_args = dict(firm_col="Firm", price_col="Price", cost_col="Marginal_cost",
+                       share_col="Market_share", period_col="Period")
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pr = M.panzar_rosse(df, executor=pool, **pr_args)
+        boone = M.boone(df, executor=pool, **boone_args)
+        lerner = M.lerner(df, executor=pool, **lerner_args)
+
+    serial_pr = M.panzar_rosse(df, **pr_args)
+    assert list(pr) == list(serial_pr)
+    assert all(pr[p]["H"] == serial_pr[p]["H"] and np.array_equal(pr[p].bse, serial_pr[p].bse) for p in pr)
+    serial_boone = M.boone(df, **boone_args)
+    assert all(boone[p]["coefficients"] == serial_boone[p]["coefficients"] for p in boone)
+    assert lerner == M.lerner(df, **lerner_args)
+
+    assert M.lerner(df, n_jobs=2, **lerner_args) == lerner
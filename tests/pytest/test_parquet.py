@@ -0,0 +1,43 @@
+# tests/pytest/test_parquet.py
+import numpy as np
+import pytest
+from tests.pytest._helpers import _build_df, _expected_hhi, _expected_boone
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_methods_accept_parquet_and_arrow_sources(tmp_path):
+    from market_competition_metrics import MarketCompetitionMetrics as M
+
+    df = _build_df()
+    path = tmp_path / "market.parquet"
+    df.to_parquet(path)
+    table = pa.Table.from_pandas(df)
+    cost_cols = ["Labor_cost", "Capital_cost", "Wage_cost"]
+
+    for source in (str(path), path, table):
+        hhi = M.hhi(source, "Market_share", "Period")
+        assert all(np.isclose(hhi[p], _expected_hhi[p], rtol=1e-6) for p in _expected_hhi)
+        boone = M.boone(source, cost_cols, "Profit", "Period", inference=False)
+        assert all(np.isclose(boone[p]["Boone"], _expected_boone[p], rtol=1e-6) for p in _expected_boone)
+
+    assert M.hhi_stream(path, "Market_share", "Period", chunksize=4).keys() == _expected_hhi.keys()
+
+
+def test_partition_pruning_and_filters(tmp_path):
+    from market_competition_metrics import MarketCompetitionMetrics as M
+    from market_competition_metrics._arrow import read_columns
+
+    df = _build_df()
+    pq.write_to_dataset(pa.Table.from_pandas(df, preserve_index=False), tmp_path, partition_cols=["Period"])
+
+    hhi = M.hhi(tmp_path, "Market_share", "Period", filters=[("Period", ">=", "2025-02-01")])
+    assert list(hhi) == ["2025-02-01", "2025-03-01"]
+    assert np.isclose(hhi["2025-03-01"], _expected_hhi["2025-03-01"], rtol=1e-6)
+
+    frame = read_columns(tmp_path, ["Market_share", "Period"], [("Period", "==", "2025-01-01")])
+    assert list(frame.columns) == ["Market_share", "Period"] and len(frame) == 5
+
+    with pytest.raises(ValueError):
+        M.hhi(df, "Market_share", "Period", filters=[("Period", "==", "2025-01-01")])
@@ -0,0 +1,61 @@
+# tests/pytest/test_plot_export.py
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Batch export must not go through pyplot (no global figure state, no GUI backend).
+_SCRIPT = """
+import json, sys
+from market_competition_metrics import MarketCompetitionMetrics as M
+from market_competition_metrics.synthetic import generate_market_data
+df = generate_market_data(n_firms=40, n_periods=6, n_markets=3, seed=0)
+keys = ["Market", "Period"]
+M.hhi(df, "Market_share", keys, plot=True, plot_dir=sys.argv[1])
+M.lerner(df, "Firm", "Price", "Marginal_cost", "Market_share", keys, stacked=True,
+         plot_dir=sys.argv[1], plot_format="svg")
+print(json.dumps({"pyplot": "matplotlib.pyplot" in sys.modules}))
+"""
+
+
+def test_plot_dir_writes_one_file_per_market_without_pyplot(tmp_path):
+    out = subprocess.run([sys.executable, "-c", _SCRIPT, str(tmp_path)], capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout) == {"pyplot": False}
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 6
+    assert sum(name.startswith("hhi_") and name.endswith(".png") for name in files) == 3
+    assert sum(name.startswith("lerner_contributions_") and name.endswith(".svg") for name in files) == 3
+    assert all((tmp_path / name).stat().st_size > 0 for name in files)
+
+
+def test_downsample_and_merge_minor():
+    from market_competition_metrics._plotting import downsample, merge_minor
+
+    labels, values = downsample(list(range(1000)), np.arange(1000.0), max_points=10)
+    assert len(labels) == 10 and labels[-1] == 999
+    assert np.isclose(values.mean(), np.arange(1000.0).mean())
+
+    matrix = pd.DataFrame(np.arange(40.0).reshape(20, 2), index=[f"F{i}" for i in range(20)])
+    merged = merge_minor(matrix, max_firms=5)
+    assert list(merged.index) == ["F15", "F16", "F17", "F18", "F19", "Other"]
+    assert np.allclose(merged.sum(axis=0), matrix.sum(axis=0))
+
+
+def test_interactive_charts_are_not_reduced(monkeypatch):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from market_competition_metrics._plotting import plot_contributions, plot_series
+
+    monkeypatch.setattr(plt, "show", lambda: None)
+    keys = pd.Index(range(600), name="Period")
+    plot_series(keys, np.arange(600.0), "hhi", "HHI", "HHI", "blue")
+    assert len(plt.gca().lines[0].get_xdata()) == 600
+    plt.close("all")
+
+    matrix = pd.DataFrame(np.ones((20, 3)), index=[f"F{i}" for i in range(20)], columns=keys[:3])
+    plot_contributions(keys[:3], matrix, "lerner_contributions")
+    assert len(plt.gca().get_legend().get_texts()) == 20
+    plt.close("all")
@@ -0,0 +1,71 @@
+# tests/pytest/test_rolling.py
+import numpy as np
+import pandas as pd
+from tests.pytest._helpers import _build_df, _expected
+
+
+def test_rolling_window_of_one_period_matches_per_period():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    res = MarketCompetitionMetrics.rolling_panzar_rosse(
+        _build_df(), revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"],
+        period_col="Period", window=1
+    )
+    assert list(res["window_end"]) == list(_expected["panzar"])
+    assert np.allclose(res["H"], list(_expected["panzar"].values()), rtol=2e-3)
+    assert list(res["nobs"]) == [5, 5, 5]
+
+
+def test_rolling_boone_matches_pooled_fit():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    cost_cols = ["Labor_cost", "Capital_cost", "Wage_cost"]
+    res = MarketCompetitionMetrics.rolling_boone(
+        df, cost_cols=cost_cols, profit_col="Profit", period_col="Period", window=2, min_periods=1
+    )
+    assert list(res["window_start"]) == ["2025-01-01", "2025-01-01", "2025-02-01"]
+    assert list(res["nobs"]) == [5, 10, 10]
+
+    for _, row in res.iloc[1:].iterrows():
+        pooled = MarketCompetitionMetrics.boone(
+            df[(df["Period"] >= row["window_start"]) & (df["Period"] <= row["window_end"])],
+            cost_cols=cost_cols, profit_col="Profit"
+        )
+        assert np.isclose(row["Boone"], pooled["Boone"], rtol=1e-8)
+        assert np.isclose(row["Wage_cost"], pooled["coefficients"]["Wage_cost"], rtol=1e-8)
+
+
+def test_rolling_windows_stay_within_each_market():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    panel = pd.concat([df.assign(Market="Market_1"), df.assign(Market="Market_2")], ignore_index=True)
+    res = MarketCompetitionMetrics.rolling_panzar_rosse(
+        panel, revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"],
+        period_col=["Market", "Period"], window=2
+    )
+    assert [(start[0], end[0]) for start, end in zip(res["window_start"], res["window_end"])] == \
+        [("Market_1", "Market_1")] * 2 + [("Market_2", "Market_2")] * 2
+    single = MarketCompetitionMetrics.rolling_panzar_rosse(
+        df, revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period", window=2
+    )
+    assert np.allclose(res["H"], np.tile(single["H"], 2), rtol=1e-8)
+    assert list(res["nobs"]) == [10, 10, 10, 10]
+
+
+def test_non_finite_row_only_invalidates_its_windows():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=8, n_periods=6, seed=0)
+    args = dict(revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"], period_col="Period", window=2)
+    clean = MarketCompetitionMetrics.rolling_panzar_rosse(df, **args)
+    assert df.loc[0, "Period"] == "P1"
+    df.loc[0, "Labor_cost"] = 0.0  # log(0) = -inf in P1 only
+    res = MarketCompetitionMetrics.rolling_panzar_rosse(df, **args)
+
+    assert list(res["window_start"]) == ["P1", "P2", "P3", "P4", "P5"]
+    assert np.isnan(res["H"].iloc[0])
+    assert np.allclose(res["H"].iloc[1:], clean["H"].iloc[1:], rtol=1e-8)
+    assert list(res["nobs"]) == [16] * 5
@@ -0,0 +1,85 @@
+# tests/pytest/test_state.py
+import numpy as np
+from tests.pytest._helpers import _build_df, _expected
+
+
+def _state():
+    from market_competition_metrics import CompetitionState
+
+    return CompetitionState(
+        "Period", share_col="Market_share", price_col="Price", cost_col="Marginal_cost",
+        revenue_col="Revenue", input_cols=["Labor_cost", "Capital_cost"],
+        profit_col="Profit", cost_cols=["Labor_cost", "Capital_cost", "Wage_cost"]
+    )
+
+
+def _assert_matches_reference(state):
+    for name, key, method in [("hhi", None, state.hhi), ("lerner", None, state.lerner),
+                              ("panzar", "H", state.panzar_rosse), ("boone", "Boone", state.boone)]:
+        res = method()
+        for period, expected in _expected[name].items():
+            value = res[period] if key is None else res[period][key]
+            assert np.isclose(value, expected, rtol=3e-3), (name, period)
+
+
+def test_state_built_incrementally_matches_batch(tmp_path):
+    df = _build_df()
+    state = _state().append(df[df["Period"] < "2025-03-01"])
+    assert state.periods == ["2025-01-01", "2025-02-01"]
+
+    path = tmp_path / "state.pkl"
+    state.save(path)
+    state = type(state).load(path)
+    state.append(df[df["Period"] == "2025-03-01"])
+    _assert_matches_reference(state)
+
+
+def test_state_corrections_only_touch_their_period():
+    df = _build_df()
+    state = _state().append(df)
+    before = state.hhi()
+
+    bad = df[df["Period"] == "2025-02-01"].copy()
+    bad["Market_share"] *= 2
+    state.replace(bad)
+    after = state.hhi()
+    assert after["2025-01-01"] == before["2025-01-01"]
+    assert np.isclose(after["2025-02-01"], 4 * before["2025-02-01"])
+
+    state.retract(bad).append(df[df["Period"] == "2025-02-01"])
+    _assert_matches_reference(state)
+
+
+def test_empty_state_returns_empty_results():
+    state = _state()
+    assert state.hhi() == state.lerner() == state.panzar_rosse() == state.boone() == {}
+
+    df = _build_df()
+    state.append(df).retract(df)
+    assert state.periods == [] and state.boone(inference=False) == {}
+
+
+def test_failed_retract_leaves_state_unchanged():
+    import pytest
+
+    df = _build_df()
+    state = _state().append(df[df["Period"] < "2025-03-01"])
+    periods, hhi = state.periods, state.hhi()
+    with pytest.raises(KeyError):
+        state.retract(df)
+    assert state.periods == periods and state.hhi() == hhi
+
+
+def test_retracting_a_non_finite_row_restores_its_period():
+    df = _build_df()
+    good = df[df["Period"] == "2025-01-01"]
+    bad = good.copy()
+    bad.iloc[0, bad.columns.get_loc("Labor_cost")] = 0.0  # log(0) = -inf
+
+    state = _state().append(df[df["Period"] != "2025-01-01"]).append(bad)
+    res = state.panzar_rosse()
+    assert np.isnan(res["2025-01-01"]["H"]) and res["2025-01-01"].nobs == 5
+    assert np.isclose(res["2025-02-01"]["H"], _expected["panzar"]["2025-02-01"], rtol=3e-3)
+
+    state.retract(bad.iloc[[0]]).append(good.iloc[[0]])
+    _assert_matches_reference(state)
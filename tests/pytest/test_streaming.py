@@ -0,0 +1,38 @@
+# tests/pytest/test_streaming.py
+import numpy as np
+from tests.pytest._helpers import _build_df, _expected
+
+
+def test_hhi_stream_from_csv_chunks(tmp_path):
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    path = tmp_path / "market.csv"
+    _build_df().to_csv(path, index=False)
+    res = MarketCompetitionMetrics.hhi_stream(path, share_col="Market_share", period_col="Period", chunksize=4)
+    assert list(res) == list(_expected["hhi"])
+    for period, expected in _expected["hhi"].items():
+        assert np.isclose(res[period], expected, rtol=1e-3)
+
+    total = MarketCompetitionMetrics.hhi_stream(path, share_col="Market_share", chunksize=4)
+    assert np.isclose(total, MarketCompetitionMetrics.hhi(_build_df(), share_col="Market_share"))
+
+
+def test_lerner_stream_from_iterator():
+    from market_competition_metrics import MarketCompetitionMetrics
+
+    df = _build_df()
+    chunks = (df.iloc[i:i + 4] for i in range(0, len(df), 4))
+    res = MarketCompetitionMetrics.lerner_stream(
+        chunks, price_col="Price", cost_col="Marginal_cost", share_col="Market_share", period_col="Period"
+    )
+    for period, expected in _expected["lerner"].items():
+        assert np.isclose(res[period], expected, rtol=2e-3)
+
+    chunks = (df.iloc[i:i + 4] for i in range(0, len(df), 4))
+    overall = MarketCompetitionMetrics.lerner_stream(
+        chunks, price_col="Price", cost_col="Marginal_cost", share_col="Market_share"
+    )
+    ref = MarketCompetitionMetrics.lerner(
+        df, firm_col="Firm", price_col="Price", cost_col="Marginal_cost", share_col="Market_share"
+    )
+    assert np.isclose(overall["overall_market"], ref["overall_market"])
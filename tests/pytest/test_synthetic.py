@@ -0,0 +1,37 @@
+# tests/pytest/test_synthetic.py
+import numpy as np
+from tests.pytest._helpers import _build_df
+
+
+def test_generated_data_matches_sample_schema():
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=7, n_periods=4, seed=0)
+    assert list(df.columns) == list(_build_df().columns)
+    assert len(df) == 28
+    assert np.allclose(df.groupby("Period")["Market_share"].sum(), 100)
+    assert (df[["Revenue", "Profit", "Labor_cost", "Capital_cost", "Wage_cost"]] > 0).all().all()
+    assert (df["Price"] > df["Marginal_cost"]).all()
+
+
+def test_generated_data_skew_and_markets():
+    from market_competition_metrics import MarketCompetitionMetrics
+    from market_competition_metrics.synthetic import generate_market_data
+
+    flat = generate_market_data(n_firms=20, n_periods=5, skew=0.0, seed=1)
+    steep = generate_market_data(n_firms=20, n_periods=5, skew=2.0, seed=1)
+    hhi_flat = MarketCompetitionMetrics.hhi(flat, "Market_share", "Period")
+    hhi_steep = MarketCompetitionMetrics.hhi(steep, "Market_share", "Period")
+    assert all(hhi_steep[p] > hhi_flat[p] for p in hhi_flat)
+
+    panel = generate_market_data(n_firms=3, n_periods=2, n_markets=4, seed=2)
+    assert panel.columns[0] == "Market" and len(panel) == 24
+    assert np.allclose(panel.groupby(["Market", "Period"])["Market_share"].sum(), 100)
+
+
+def test_generated_periods_scale_past_the_datetime_range():
+    from market_competition_metrics.synthetic import generate_market_data
+
+    df = generate_market_data(n_firms=2, n_periods=20000, seed=0)
+    periods = df["Period"].unique()
+    assert len(periods) == 20000 and periods[0] == "P00001" and list(periods) == sorted(periods)